@@ -6,21 +6,75 @@ Commands: /send_embed, /edit_embed, /dl_embed, /cancel_scheduled_embed
 import discord
 from discord.ext import commands
 from discord import app_commands
-import base64
 import json
 import random
+import re
 import string
-from urllib.parse import urlparse, parse_qs, quote
 from io import BytesIO
 from datetime import datetime
-import pytz
 import asyncio
+import heapq
+import time
+
+try:
+    # SIMD (AVX2/SSSE3/NEON) codec; same API as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    # Rust encoder/decoder; dumps() returns compact UTF-8 bytes
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
 
 from db.database import Database
+from utils.constants import TZ_MANILA
 from utils.logger import get_log_channel
 from utils.views import CancelScheduledEmbedView
 
 
+# Discohook share link -> base64url "data" payload, extracted in one scan
+DISCOHOOK_RE = re.compile(r"https://discohook\.(?:org|app)/\?(?:[^#]*?&)?data=([A-Za-z0-9_-]*)")
+
+# Trailing guild/channel/message IDs of a Discord message link
+MSG_LINK_RE = re.compile(r"/(\d+)/(\d+)/(\d+)/?\s*$")
+
+
+# Payloads longer than this are decoded on a worker thread
+DECODE_INLINE_MAX = 16_384
+
+
+# How long a channel's webhook list is reused by /edit_embed (seconds)
+WEBHOOK_CACHE_TTL = 60
+
+# Base64 padding needed for each input length mod 4
+_PAD = ("", "===", "==", "=")
+
+
+def _decode_payload(encoded_json: str):
+    """Decode a Discohook data payload to (content, embeds_data, components_data)."""
+    encoded_json += _PAD[len(encoded_json) & 3]
+    data = _json_loads(base64.urlsafe_b64decode(encoded_json))
+    message_data = data["messages"][0]["data"]
+    return (
+        message_data.get("content", ""),
+        message_data.get("embeds", []),
+        message_data.get("components", []),
+    )
+
+
+def build_embeds(embeds_data):
+    """Build discord.Embed objects from Discohook embed dicts."""
+    if len(embeds_data) == 1:  # The usual payload: a single embed
+        return [discord.Embed.from_dict(embeds_data[0])]
+    return [discord.Embed.from_dict(e) for e in embeds_data]
+
+
 def discohook_to_view(components_data):
     """Convert Discohook component JSON to a discord.py View."""
     if not components_data:
@@ -69,6 +123,13 @@ def discohook_to_view(components_data):
     return view if len(view.children) > 0 else None
 
 
+def _log_send_failures(results):
+    """Print any exceptions returned by a gather(..., return_exceptions=True)."""
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Failed to send embed message: {result}")
+
+
 def generate_identifier(length=6):
     return "".join(random.choices(string.ascii_uppercase + string.digits, k=length))
 
@@ -76,49 +137,96 @@ def generate_identifier(length=6):
 class Embeds(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.scheduled_tasks: list[asyncio.Task] = []
+        # Sends in flight (strong refs until they finish)
+        self.scheduled_tasks: set[asyncio.Task] = set()
+        # Pending scheduled_embeds rows by identifier, loaded once and kept in step with the table
+        self.scheduled: dict[str, dict] = {}
+        # One timer for every schedule: (fire_at epoch, identifier, entry) min-heap
+        self._heap: list[tuple[float, str, dict]] = []
+        self._wake = asyncio.Event()
+        self._scheduler_task: asyncio.Task | None = None
+        # channel_id -> (fetched_at monotonic, webhooks)
+        self._webhook_cache: dict[int, tuple[float, list[discord.Webhook]]] = {}
         self.bot.loop.create_task(self._load_and_schedule())
 
+    def cog_unload(self):
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+
+    def forget_scheduled(self, identifier: str):
+        """Drop a fired or cancelled entry from the in-memory index.
+
+        A cancelled entry's heap slot is left in place and skipped when due.
+        """
+        self.scheduled.pop(identifier, None)
+
+    def _schedule(self, entry: dict):
+        """Queue *entry* on the scheduler heap and wake the loop if it's now first."""
+        dt = entry["schedule_for"]
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=TZ_MANILA)
+        heapq.heappush(self._heap, (dt.timestamp(), entry["identifier"], entry))
+        self._wake.set()
+
+    async def _scheduler_loop(self):
+        """Sleep until the earliest scheduled embed is due, then send it."""
+        while True:
+            if not self._heap:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            _, _, entry = heapq.heappop(self._heap)
+            if self.scheduled.get(entry["identifier"]) is not entry:
+                continue  # Cancelled since it was queued
+            task = asyncio.create_task(self._send_scheduled(entry))
+            self.scheduled_tasks.add(task)
+            task.add_done_callback(self.scheduled_tasks.discard)
+
     # ── Startup: reschedule pending embeds ─────────────────────
 
     async def _load_and_schedule(self):
         await self.bot.wait_until_ready()
-        tz = pytz.timezone("Asia/Manila")
-        now = datetime.now(tz)
+        now = datetime.now(TZ_MANILA)
 
         rows = await Database.fetchall("SELECT * FROM scheduled_embeds")
         for entry in rows:
             dt = entry["schedule_for"]
             if dt.tzinfo is None:
-                dt = tz.localize(dt)
+                dt = dt.replace(tzinfo=TZ_MANILA)
             if dt > now:
-                self.scheduled_tasks.append(
-                    asyncio.create_task(self._delayed_send(entry))
-                )
+                self.scheduled[entry["identifier"]] = entry
+                self._schedule(entry)
             else:
                 # Past due — send immediately or clean up
                 await Database.execute(
                     "DELETE FROM scheduled_embeds WHERE id = %s", (entry["id"],)
                 )
 
-    async def _delayed_send(self, entry):
-        try:
-            tz = pytz.timezone("Asia/Manila")
-            dt = entry["schedule_for"]
-            if dt.tzinfo is None:
-                dt = tz.localize(dt)
-            now = datetime.now(tz)
-            delay = (dt - now).total_seconds()
-            if delay > 0:
-                await asyncio.sleep(delay)
+        self._scheduler_task = asyncio.create_task(self._scheduler_loop())
 
+    async def _send_scheduled(self, entry):
+        try:
             channel = self.bot.get_channel(entry["channel_id"])
             if not channel:
                 return
 
-            embeds_data = json.loads(entry["embeds_json"])
-            components_data = json.loads(entry["components_json"]) if entry.get("components_json") else None
-            embeds = [discord.Embed.from_dict(e) for e in embeds_data]
+            # Entries scheduled this session carry their built embeds/components;
+            # rows loaded at startup are parsed here, once
+            embeds = entry.get("_embeds")
+            if embeds is None:
+                embeds = build_embeds(_json_loads(entry["embeds_json"]))
+            components_data = entry.get("_components")
+            if components_data is None and entry.get("components_json"):
+                components_data = _json_loads(entry["components_json"])
             view = discohook_to_view(components_data)
 
             sent_message = await channel.send(
@@ -141,35 +249,43 @@ class Embeds(commands.Cog):
         except Exception as e:
             print(f"Failed to send scheduled embed: {e}")
         finally:
+            self.forget_scheduled(entry["identifier"])
             await Database.execute(
                 "DELETE FROM scheduled_embeds WHERE identifier = %s", (entry["identifier"],)
             )
 
+    # ── Webhook cache ──────────────────────────────────────────
+
+    async def _channel_webhooks(self, channel) -> list[discord.Webhook]:
+        """Return *channel*'s webhooks, reusing a listing fetched within the TTL."""
+        cached = self._webhook_cache.get(channel.id)
+        if cached and time.monotonic() - cached[0] < WEBHOOK_CACHE_TTL:
+            return cached[1]
+        webhooks = await channel.webhooks()
+        self._webhook_cache[channel.id] = (time.monotonic(), webhooks)
+        return webhooks
+
+    @commands.Cog.listener()
+    async def on_webhooks_update(self, channel):
+        self._webhook_cache.pop(channel.id, None)
+
     # ── Discohook link parser ──────────────────────────────────
 
     async def _parse_discohook(self, link: str, interaction: discord.Interaction):
         """Parse a Discohook link and return (content, embeds_data, components_data) or None on error."""
-        if not (link.startswith("https://discohook.org/?data=") or link.startswith("https://discohook.app/?data=")):
+        match = DISCOHOOK_RE.match(link.strip())
+        if not match:
             await interaction.followup.send("❌ Invalid Discohook link!", ephemeral=True)
             return None
         try:
-            parsed_url = urlparse(link)
-            query_params = parse_qs(parsed_url.query)
-            encoded_json = query_params.get("data", [None])[0]
+            encoded_json = match.group(1)
             if not encoded_json:
                 await interaction.followup.send("❌ No valid data found in the link.", ephemeral=True)
                 return None
-            missing_padding = len(encoded_json) % 4
-            if missing_padding:
-                encoded_json += "=" * (4 - missing_padding)
-            decoded_json = base64.urlsafe_b64decode(encoded_json).decode("utf-8")
-            data = json.loads(decoded_json)
-            message_data = data["messages"][0]["data"]
-            return (
-                message_data.get("content", ""),
-                message_data.get("embeds", []),
-                message_data.get("components", []),
-            )
+            # Big payloads (long_link) would stall the event loop while decoding
+            if len(encoded_json) > DECODE_INLINE_MAX:
+                return await asyncio.to_thread(_decode_payload, encoded_json)
+            return _decode_payload(encoded_json)
         except Exception as e:
             await interaction.followup.send(f"❌ Failed to parse Discohook link: {e}", ephemeral=True)
             return None
@@ -201,16 +317,15 @@ class Embeds(commands.Cog):
             return
         message_content, embeds_data, components_data = result
 
-        embeds = [discord.Embed.from_dict(e) for e in embeds_data]
+        embeds = build_embeds(embeds_data)
         view = discohook_to_view(components_data)
 
         # Scheduled
         if schedule_for:
             try:
-                tz = pytz.timezone("Asia/Manila")
                 dt = datetime.strptime(schedule_for, "%d/%m/%Y %H:%M")
-                dt = tz.localize(dt)
-                now = datetime.now(tz)
+                dt = dt.replace(tzinfo=TZ_MANILA)
+                now = datetime.now(TZ_MANILA)
                 if (dt - now).total_seconds() <= 0:
                     await interaction.followup.send("❌ The scheduled time must be in the future.", ephemeral=True)
                     return
@@ -219,31 +334,43 @@ class Embeds(commands.Cog):
                 return
 
             identifier = generate_identifier()
+            # Same shape as a scheduled_embeds row, so no read-back is needed
+            entry = {
+                "identifier": identifier,
+                "guild_id": interaction.guild_id,
+                "channel_id": channel.id,
+                "user_id": interaction.user.id,
+                "content": message_content,
+                "embeds_json": _json_dumps(embeds_data).decode(),
+                "components_json": _json_dumps(components_data).decode(),
+                "schedule_for": dt,
+                # In-memory only: reused at send time instead of re-parsing the JSON
+                "_embeds": embeds,
+                "_components": components_data,
+            }
             await Database.execute(
                 "INSERT INTO scheduled_embeds (identifier, guild_id, channel_id, user_id, content, embeds_json, components_json, schedule_for) "
                 "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
                 (
-                    identifier, interaction.guild_id, channel.id, interaction.user.id,
-                    message_content, json.dumps(embeds_data), json.dumps(components_data),
+                    identifier, entry["guild_id"], entry["channel_id"], entry["user_id"],
+                    entry["content"], entry["embeds_json"], entry["components_json"],
                     dt.strftime("%Y-%m-%d %H:%M:%S"),
                 ),
             )
+            self.scheduled[identifier] = entry
+            self._schedule(entry)
 
-            entry = await Database.fetchone(
-                "SELECT * FROM scheduled_embeds WHERE identifier = %s", (identifier,)
-            )
-            self.scheduled_tasks.append(asyncio.create_task(self._delayed_send(entry)))
-
-            await interaction.followup.send(
-                f"⏰ Embed scheduled for {dt.strftime('%d/%m/%Y %H:%M')} UTC+8 in {channel.mention}.\n"
-                f"**Identifier:** `{identifier}`",
-                ephemeral=True,
-            )
-
-            # Log preview
+            # Confirmation and log preview are independent — send them together
             log_channel = await get_log_channel(self.bot, interaction.guild_id, "embeds")
+            sends = [
+                interaction.followup.send(
+                    f"⏰ Embed scheduled for {dt.strftime('%d/%m/%Y %H:%M')} UTC+8 in {channel.mention}.\n"
+                    f"**Identifier:** `{identifier}`",
+                    ephemeral=True,
+                )
+            ]
             if log_channel:
-                await log_channel.send(
+                sends.append(log_channel.send(
                     content=(
                         f"📝 **Scheduled embed PREVIEW**\n"
                         f"**ID:** `{identifier}`\n"
@@ -254,41 +381,41 @@ class Embeds(commands.Cog):
                     ),
                     embeds=embeds,
                     view=view,
-                )
+                ))
+            _log_send_failures(await asyncio.gather(*sends, return_exceptions=True))
             return
 
         # Immediate send
         sent_message = await channel.send(content=message_content, embeds=embeds, view=view)
         message_link = f"https://discord.com/channels/{interaction.guild_id}/{channel.id}/{sent_message.id}"
-        await interaction.followup.send(
-            f"✅ Embed sent to {channel.mention}: [Jump to Message]({message_link})", ephemeral=True,
-        )
-
         log_channel = await get_log_channel(self.bot, interaction.guild_id, "embeds")
+        sends = [
+            interaction.followup.send(
+                f"✅ Embed sent to {channel.mention}: [Jump to Message]({message_link})", ephemeral=True,
+            )
+        ]
         if log_channel:
             log_embed = discord.Embed(title="📢 Embed Sent", color=discord.Color.gold())
             log_embed.set_author(name=str(interaction.user), icon_url=interaction.user.display_avatar.url)
             log_embed.add_field(name="User", value=interaction.user.mention, inline=True)
             log_embed.add_field(name="Channel", value=channel.mention, inline=True)
             log_embed.add_field(name="Link", value=f"[Jump to Message]({message_link})", inline=False)
-            await log_channel.send(embed=log_embed)
+            sends.append(log_channel.send(embed=log_embed))
+        _log_send_failures(await asyncio.gather(*sends, return_exceptions=True))
 
     # ── /cancel_scheduled_embed ────────────────────────────────
 
     @app_commands.command(name="cancel_scheduled_embed", description="Cancel a scheduled embed.")
     async def cancel_scheduled_embed(self, interaction: discord.Interaction):
-        rows = await Database.fetchall(
-            "SELECT identifier, schedule_for FROM scheduled_embeds WHERE guild_id = %s",
-            (interaction.guild_id,),
-        )
-        if not rows:
+        scheduled_list = [
+            {"identifier": e["identifier"], "schedule_for": e["schedule_for"].strftime("%Y-%m-%d %H:%M:%S")}
+            for e in self.scheduled.values()
+            if e["guild_id"] == interaction.guild_id
+        ]
+        if not scheduled_list:
             await interaction.response.send_message("No scheduled embeds.", ephemeral=True)
             return
 
-        scheduled_list = [
-            {"identifier": r["identifier"], "schedule_for": str(r["schedule_for"])}
-            for r in rows
-        ]
         view = CancelScheduledEmbedView(scheduled_list, self, interaction.user)
         await interaction.response.send_message("Select a scheduled embed to cancel:", view=view, ephemeral=True)
 
@@ -318,16 +445,16 @@ class Embeds(commands.Cog):
         message_content, embeds_data, components_data = result
 
         try:
-            parts = message_link.strip().split("/")
-            if len(parts) < 7:
+            link_match = MSG_LINK_RE.search(message_link)
+            if not link_match:
                 await interaction.followup.send("❌ Invalid message link format.", ephemeral=True)
                 return
 
-            guild_id, channel_id, msg_id = int(parts[-3]), int(parts[-2]), int(parts[-1])
+            guild_id, channel_id, msg_id = map(int, link_match.groups())
             channel = interaction.guild.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
             target_message = await channel.fetch_message(msg_id)
 
-            new_embeds = [discord.Embed.from_dict(e) for e in embeds_data]
+            new_embeds = build_embeds(embeds_data)
             new_view = discohook_to_view(components_data)
 
             if target_message.author.id == self.bot.user.id:
@@ -338,7 +465,7 @@ class Embeds(commands.Cog):
                 return
 
             if target_message.webhook_id:
-                webhooks = await channel.webhooks()
+                webhooks = await self._channel_webhooks(channel)
                 webhook = next((w for w in webhooks if w.id == target_message.webhook_id), None)
                 if webhook and webhook.token:
                     await webhook.edit_message(
@@ -364,12 +491,12 @@ class Embeds(commands.Cog):
     @app_commands.describe(message_link="Link to the Discord message containing the embed.")
     async def dl_embed(self, interaction: discord.Interaction, message_link: str):
         try:
-            parts = message_link.strip().split("/")
-            if len(parts) < 7:
+            link_match = MSG_LINK_RE.search(message_link)
+            if not link_match:
                 await interaction.response.send_message("❌ Invalid message link format.", ephemeral=True)
                 return
 
-            guild_id, channel_id, msg_id = int(parts[-3]), int(parts[-2]), int(parts[-1])
+            guild_id, channel_id, msg_id = map(int, link_match.groups())
             channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
             message = await channel.fetch_message(msg_id)
 
@@ -388,9 +515,9 @@ class Embeds(commands.Cog):
                 }]
             }
 
-            json_string = json.dumps(payload)
-            encoded = base64.urlsafe_b64encode(json_string.encode()).decode().rstrip("=")
-            discohook_link = f"https://discohook.app/?data={quote(encoded)}"
+            # Strip padding on the bytes so only one str is ever built
+            encoded = base64.urlsafe_b64encode(_json_dumps(payload)).rstrip(b"=").decode("ascii")
+            discohook_link = f"https://discohook.app/?data={encoded}"
 
             if len(discohook_link) > 2000:
                 buffer = BytesIO(discohook_link.encode("utf-8"))
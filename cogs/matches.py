@@ -38,6 +38,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional
 from db.database import Database
 from utils.constants import ROLE_MARSHAL
+from utils.members import ensure_member_cache, get_or_fetch_member
 
 try:
     from zoneinfo import ZoneInfo
@@ -62,6 +63,13 @@ _grace_period_tasks: Dict[int, tuple[asyncio.Task, int]] = {}
 # MatchSession model
 # ────────────────────────────────────────────────────────────────
 
+# Session attributes persisted by MatchSession._sync_session
+_SESSION_FIELDS = (
+    "status", "is_disputed", "ack_start_time", "dispute_start_time",
+    "total_dispute_seconds", "last_message_id", "team1", "team2",
+)
+
+
 class MatchSession:
     """Represents an active match session, backed by DB rows."""
 
@@ -103,36 +111,57 @@ class MatchSession:
 
     # -- DB sync helpers -----------------------------------------------------
 
-    async def _sync_session(self):
-        """Persist session-level fields to DB."""
+    async def _sync_session(self, **changes):
+        """Persist session-level fields to DB.
+
+        *changes* are written in place of the current attribute values without
+        touching the object, so a caller can apply them only once the write
+        (or its enclosing transaction) has succeeded.
+        """
+        state = {name: changes.get(name, getattr(self, name)) for name in _SESSION_FIELDS}
         await Database.execute(
             "UPDATE match_sessions SET status=%s, is_disputed=%s, "
             "ack_start_time=%s, dispute_start_time=%s, total_dispute_seconds=%s, "
             "last_message_id=%s, team1=%s, team2=%s, ended_at=%s WHERE id=%s",
             (
-                self.status,
-                self.is_disputed,
-                self.ack_start_time,
-                self.dispute_start_time,
-                self.total_dispute_seconds,
-                self.last_message_id,
-                self.team1,
-                self.team2,
-                datetime.now(timezone.utc) if self.status == "ended" else None,
+                state["status"],
+                state["is_disputed"],
+                state["ack_start_time"],
+                state["dispute_start_time"],
+                state["total_dispute_seconds"],
+                state["last_message_id"],
+                state["team1"],
+                state["team2"],
+                datetime.now(timezone.utc) if state["status"] == "ended" else None,
                 self.db_id,
             ),
         )
 
+    def _apply(self, changes: dict):
+        for name, value in changes.items():
+            setattr(self, name, value)
+
     async def add_game(self, result: str) -> dict:
         """Log a new game result and enter checking_ack state."""
         game_number = len(self.games) + 1
         now = datetime.now(timezone.utc)
 
-        game_db_id = await Database.insert_get_id(
-            "INSERT INTO match_games (session_id, game_number, result) VALUES (%s, %s, %s)",
-            (self.db_id, game_number, result),
-        )
+        changes = {
+            "status": "checking_ack",
+            "ack_start_time": now,
+            "dispute_start_time": None,
+            "total_dispute_seconds": 0,
+            "is_disputed": False,
+        }
+        # Game row + session state commit together
+        async with Database.transaction():
+            game_db_id = await Database.insert_get_id(
+                "INSERT INTO match_games (session_id, game_number, result) VALUES (%s, %s, %s)",
+                (self.db_id, game_number, result),
+            )
+            await self._sync_session(**changes)
 
+        # Mirror the commit in memory only now; a rollback leaves self untouched
         game = {
             "db_id": game_db_id,
             "game_number": game_number,
@@ -141,13 +170,7 @@ class MatchSession:
             "created_at": now,
         }
         self.games.append(game)
-
-        self.status = "checking_ack"
-        self.ack_start_time = now
-        self.dispute_start_time = None
-        self.total_dispute_seconds = 0
-        self.is_disputed = False
-        await self._sync_session()
+        self._apply(changes)
         return game
 
     async def undo_game(self) -> bool:
@@ -155,15 +178,22 @@ class MatchSession:
         if not self.games:
             return False
 
-        game = self.games.pop()
-        await Database.execute("DELETE FROM match_games WHERE id = %s", (game["db_id"],))
+        changes = {
+            "status": "ongoing",
+            "ack_start_time": None,
+            "dispute_start_time": None,
+            "total_dispute_seconds": 0,
+            "is_disputed": False,
+        }
+        # Pinned before the first await: add_game may append while we wait
+        game = self.games[-1]
+        async with Database.transaction():
+            await Database.execute("DELETE FROM match_games WHERE id = %s", (game["db_id"],))
+            await self._sync_session(**changes)
 
-        self.status = "ongoing"
-        self.ack_start_time = None
-        self.dispute_start_time = None
-        self.total_dispute_seconds = 0
-        self.is_disputed = False
-        await self._sync_session()
+        # Mirror the commit in memory only now; a rollback leaves self untouched
+        self.games.remove(game)  # Games differ by db_id, so this is that exact entry
+        self._apply(changes)
         return True
 
     async def ack_game(self, team_abbrev: str, user_display_name: str) -> bool:
@@ -569,9 +599,14 @@ class Matches(commands.Cog):
         # Safest: parse nickname.  Format is always "ABBREV | IGN".
         return row["team_name"]  # We'll use team_name as the identifier.
 
-    async def _get_player_team_abbrev(self, guild: discord.Guild, user_id: int) -> Optional[str]:
-        """Get the team abbreviation from the member's nickname (ABBREV | IGN format)."""
-        member = guild.get_member(user_id)
+    async def _get_player_team_abbrev(self, guild: discord.Guild, user: discord.abc.User) -> Optional[str]:
+        """Get the team abbreviation from the member's nickname (ABBREV | IGN format).
+
+        Pass the message author as-is: it is a Member carrying its nick even
+        when the member cache is cold, so teammates always resolve the same way.
+        """
+        user_id = user.id
+        member = user if isinstance(user, discord.Member) else await get_or_fetch_member(guild, user_id)
         if not member or not member.nick:
             # Fallback: look up team_name from DB
             row = await Database.fetchone(
@@ -1063,7 +1098,7 @@ class Matches(commands.Cog):
                     inline=False,
                 )
 
-        marshal = interaction.guild.get_member(session.marshal_id)
+        marshal = await get_or_fetch_member(interaction.guild, session.marshal_id)
         marshal_text = marshal.mention if marshal else f"ID {session.marshal_id}"
         embed.set_footer(text=f"Marshal: {marshal_text} • Started")
         embed.timestamp = session.started_at
@@ -1090,7 +1125,7 @@ class Matches(commands.Cog):
             return
 
         # Look up team
-        team = await self._get_player_team_abbrev(message.guild, message.author.id)
+        team = await self._get_player_team_abbrev(message.guild, message.author)
         if not team:
             await message.add_reaction("❓")  # Not verified
             return
@@ -1232,6 +1267,7 @@ class Matches(commands.Cog):
             )
             return
 
+        await ensure_member_cache(interaction.guild)  # Marshal names below
         lines = []
         for i, row in enumerate(rows, 1):
             t1 = row.get("team1") or "Team A"
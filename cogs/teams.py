@@ -53,25 +53,57 @@ class BulkAddTeamsModal(discord.ui.Modal):
         )
 
 
+# Discord caps a select menu at 25 options
+SELECT_PAGE_SIZE = 25
+
+
 class RemoveTeamView(discord.ui.View):
     def __init__(self, teams: list[dict], author_id: int):
         super().__init__(timeout=60)
         self.author_id = author_id
-
-        options = [
+        # Built once; pages are slices of this list
+        self.options = [
             discord.SelectOption(label=t["team_name"], value=t["team_name"])
-            for t in teams[:25]
+            for t in teams
         ]
+        self.page = 0
+        self.pages = max(1, -(-len(self.options) // SELECT_PAGE_SIZE))
 
         self.select = discord.ui.Select(
             placeholder="Select a team to remove…",
-            options=options,
             min_values=1,
             max_values=1,
         )
         self.select.callback = self.on_select
         self.add_item(self.select)
 
+        if self.pages > 1:
+            self.prev_btn = discord.ui.Button(label="Prev", style=discord.ButtonStyle.secondary)
+            self.next_btn = discord.ui.Button(label="Next", style=discord.ButtonStyle.secondary)
+            self.prev_btn.callback = self.on_prev
+            self.next_btn.callback = self.on_next
+            self.add_item(self.prev_btn)
+            self.add_item(self.next_btn)
+        self._render_page()
+
+    def _render_page(self):
+        start = self.page * SELECT_PAGE_SIZE
+        self.select.options = self.options[start:start + SELECT_PAGE_SIZE]
+        if self.pages > 1:
+            self.select.placeholder = f"Select a team to remove… (page {self.page + 1}/{self.pages})"
+            self.prev_btn.disabled = self.page == 0
+            self.next_btn.disabled = self.page == self.pages - 1
+
+    async def on_prev(self, interaction: discord.Interaction):
+        self.page -= 1
+        self._render_page()
+        await interaction.response.edit_message(view=self)
+
+    async def on_next(self, interaction: discord.Interaction):
+        self.page += 1
+        self._render_page()
+        await interaction.response.edit_message(view=self)
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != self.author_id:
             await interaction.response.send_message("This is not for you.", ephemeral=True)
@@ -9,6 +9,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from db.database import Database
+from utils.members import ensure_member_cache
 import asyncio
 
 
@@ -45,6 +46,7 @@ class Threads(commands.Cog):
         # Collect members from role
         members_to_add: list[discord.Member] = []
         if role:
+            await ensure_member_cache(interaction.guild)  # role.members reads the cache
             members_to_add = [m for m in role.members if not m.bot]
 
         created_threads: list[tuple[str, str, int]] = []  # (name, mention, thread_id)
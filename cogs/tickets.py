@@ -20,6 +20,7 @@ from utils.constants import (
     ROLE_LEAGUE_OPS,
     TZ_MANILA,
 )
+from utils.members import get_or_fetch_member
 
 # ────────────────────────────────────────────────────────────────
 # HTML Transcript Generator  (kept from reference)
@@ -94,14 +95,18 @@ def generate_html_transcript(messages: list[discord.Message], channel_name: str)
             timestamp = created_at_pht.strftime('%m/%d/%Y %I:%M %p')
 
             content = html_mod.escape(msg.content or "")
+            # Mentioned users arrive with the message, so they resolve even
+            # when the member cache is cold
+            mentioned = {u.id: u for u in msg.mentions}
 
             def replace_user(match):
                 uid = int(match.group(1))
                 name = f"@{uid}"
-                if guild:
+                member = mentioned.get(uid)
+                if member is None and guild:
                     member = guild.get_member(uid)
-                    if member:
-                        name = f"@{member.display_name}"
+                if member:
+                    name = f"@{member.display_name}"
                 return f'<span class="mention">{html_mod.escape(name)}</span>'
             content = re.sub(r'&lt;@!?(\d+)&gt;', replace_user, content)
 
@@ -539,7 +544,7 @@ class MoveCategorySelect(discord.ui.Select):
         # Determine creator name for rename
         creator_name = "unknown"
         if ticket_data and ticket_data.get("creator_id"):
-            mem = interaction.guild.get_member(ticket_data["creator_id"])
+            mem = await get_or_fetch_member(interaction.guild, ticket_data["creator_id"])
             if mem:
                 creator_name = mem.name
             else:
@@ -1017,8 +1022,7 @@ class Tickets(commands.Cog):
         for data in tickets:
             created_at = data["created_at"]
             if created_at.tzinfo is None:
-                import pytz
-                created_at = pytz.utc.localize(created_at)
+                created_at = created_at.replace(tzinfo=datetime.timezone.utc)
             elapsed = now - created_at
 
             channel = self.bot.get_channel(data["channel_id"])
@@ -1097,8 +1101,10 @@ class Tickets(commands.Cog):
         self, interaction: discord.Interaction, channel: discord.TextChannel
     ):
         # Write to both keys: centralized + legacy for backward compatibility
-        await Database.set_config(interaction.guild_id, "log_channel_tickets", str(channel.id))
-        await Database.set_config(interaction.guild_id, "ticket_log_channel_id", str(channel.id))
+        await Database.set_config_many(interaction.guild_id, {
+            "log_channel_tickets": str(channel.id),
+            "ticket_log_channel_id": str(channel.id),
+        })
         await interaction.response.send_message(
             f"Ticket log channel set to {channel.mention}.",
             ephemeral=True,
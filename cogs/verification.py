@@ -9,6 +9,7 @@ Admin commands:
   /refresh_verification_data -- force-refresh cached sheet data
   /set_oppo_passphrase       -- set secret passphrase for OPPO role
   /set_production_passphrase -- set secret passphrase + role for production team
+  /set_passphrase_channel    -- restrict passphrase messages to one channel
   /set_staff_code            -- set access code for coach/manager verification
   /mention_team              -- mention all verified members of a team
   /reset_verifications       -- wipe verification records (granular)
@@ -26,16 +27,132 @@ Staff flow (coaches/managers):
   3. Bot validates code + team name against sheet
   4. On match: assigns Staff role, sets nickname, saves to DB with staff_type
 """
+import asyncio
+import csv
+import io
 import discord
 from discord.ext import commands
 from discord import app_commands
 from db.database import Database
 from utils.sheet_validator import validator
-from utils.constants import VERIFICATION_ROLES
+from utils.members import ensure_member_cache
+from utils.verified_users import verified_users
+from utils.constants import (
+    VERIFICATION_ROLES, VERIFICATION_ROLE_IDS, VERIFICATION_ALWAYS_FALLBACK,
+)
 
 # Channel where Marshals will mention teams on tournament day
 MATCH_CHANNEL_ID = 1471154639893168129
 
+# Keep each mention_team message safely below Discord's 2000-char limit
+MENTION_CHUNK_LIMIT = 1900
+
+# Passphrases are capped so on_message can skip long messages unread
+PASSPHRASE_MAX_LENGTH = 64
+
+# Hot-path queries (verify clicks / modal submits)
+SQL_CHECK_VERIFIED = "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s"
+SQL_INSERT_VERIFIED = (
+    "INSERT IGNORE INTO verified_users (guild_id, discord_id, team_name, game_uid, server) "
+    "VALUES (%s, %s, %s, %s, %s)"
+)
+SQL_INSERT_VERIFIED_STAFF = (
+    "INSERT IGNORE INTO verified_users (guild_id, discord_id, team_name, game_uid, server, staff_type) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+SQL_LOOKUP_LOPS = "SELECT ign FROM lops_entries WHERE guild_id = %s AND uid = %s AND server = %s"
+
+
+def _is_numeric_id(value: str) -> bool:
+    """True for plain ASCII digit strings (str.isdigit alone accepts e.g. "١٢٣")."""
+    return value.isascii() and value.isdigit()
+
+
+# -- Guide embed -------------------------------------------------------------
+
+# (guide_url, test_mode) -> prebuilt embed. Shared between sends; never mutate.
+_guide_embeds: dict[tuple[str, bool], discord.Embed] = {}
+
+
+def _get_guide_embed(guide_url: str, test_mode: bool) -> discord.Embed:
+    """Return the "find your UID" guide embed, building it once per image URL."""
+    embed = _guide_embeds.get((guide_url, test_mode))
+    if embed is None:
+        embed = discord.Embed(
+            title="How to Find Your UID and Server ID",
+            description=(
+                "Both your **UID** and **Server ID** are numbers found in your game profile.\n"
+                "Refer to the image below, then click **Continue** to proceed."
+            ),
+            color=0xF2C21A,
+        )
+        embed.set_image(url=guide_url)
+        if test_mode:
+            embed.set_footer(text="TEST MODE")
+        _guide_embeds[(guide_url, test_mode)] = embed
+    return embed
+
+
+# -- Background helpers ------------------------------------------------------
+
+# Strong refs to fire-and-forget tasks so they aren't garbage-collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> None:
+    """Run *coro* in the background without awaiting it."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _send_dm(user: discord.abc.User, **kwargs) -> None:
+    """Send a DM, ignoring users who have DMs disabled."""
+    try:
+        await user.send(**kwargs)
+    except discord.Forbidden:
+        pass
+
+
+async def _quietly(coro) -> None:
+    """Await *coro*, ignoring missing permissions / already-deleted objects."""
+    try:
+        await coro
+    except (discord.Forbidden, discord.NotFound):
+        pass
+
+
+# -- Member update helper ----------------------------------------------------
+
+async def _apply_verification(
+    member: discord.Member, roles: list[discord.Role], nick: str | None, reason: str
+) -> None:
+    """Grant *roles* and set *nick* in a single member edit (one HTTP call)."""
+    # member.roles rebuilds a sorted list on every access; read it once
+    held = member.roles
+    held_ids = {r.id for r in held}
+    new_roles = [r for r in roles if r.id not in held_ids]
+    if member.id == member.guild.owner_id:
+        nick = None  # Bot can never change the owner's nick
+
+    changes = {}
+    if new_roles:
+        changes["roles"] = [r for r in held if not r.is_default()] + new_roles
+    if nick:
+        changes["nick"] = nick
+    if not changes:
+        return
+
+    try:
+        await member.edit(reason=reason, **changes)
+    except discord.Forbidden:
+        # Nick edits fail for members above the bot -- still grant the roles
+        if new_roles and nick:
+            try:
+                await member.add_roles(*new_roles, reason=reason)
+            except discord.Forbidden:
+                pass
+
 
 # -- Persistent button on the panel ------------------------------------------
 
@@ -51,11 +168,7 @@ class VerifyButtonView(discord.ui.View):
     )
     async def start_verify(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if already verified
-        row = await Database.fetchone(
-            "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s",
-            (interaction.guild_id, interaction.user.id),
-        )
-        if row:
+        if verified_users.is_verified(interaction.guild_id, interaction.user.id):
             await interaction.response.send_message(
                 "You are already verified!", ephemeral=True
             )
@@ -65,21 +178,8 @@ class VerifyButtonView(discord.ui.View):
         guide_url = await Database.get_config(interaction.guild_id, "verification_guide_image")
 
         if guide_url:
-            guide_embed = discord.Embed(
-                title="How to Find Your UID and Server ID",
-                description=(
-                    "Both your **UID** and **Server ID** are numbers found in your game profile.\n"
-                    "Refer to the image below, then click **Continue** to proceed."
-                ),
-                color=0xF2C21A,
-            )
-            guide_embed.set_image(url=guide_url)
-
-            if validator.is_test_mode:
-                guide_embed.set_footer(text="TEST MODE")
-
             await interaction.response.send_message(
-                embed=guide_embed,
+                embed=_get_guide_embed(guide_url, validator.is_test_mode),
                 view=ContinueToModalView(),
                 ephemeral=True,
             )
@@ -93,11 +193,7 @@ class VerifyButtonView(discord.ui.View):
     )
     async def start_staff_verify(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if already verified
-        row = await Database.fetchone(
-            "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s",
-            (interaction.guild_id, interaction.user.id),
-        )
-        if row:
+        if verified_users.is_verified(interaction.guild_id, interaction.user.id):
             await interaction.response.send_message(
                 "You are already verified!", ephemeral=True
             )
@@ -185,26 +281,22 @@ class VerifyModal(discord.ui.Modal):
         uid_raw = self.uid_input.value.strip()
         server_raw = self.server_input.value.strip()
 
-        if not uid_raw.isdigit():
+        if not _is_numeric_id(uid_raw):
             await interaction.followup.send(
                 "Your UID must contain only numbers. Please try again.",
                 ephemeral=True,
             )
             return
 
-        if not server_raw.isdigit():
+        if not _is_numeric_id(server_raw):
             await interaction.followup.send(
                 "Your Server ID must contain only numbers. Please try again.",
                 ephemeral=True,
             )
             return
 
-        # Race condition guard
-        existing = await Database.fetchone(
-            "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s",
-            (guild.id, user.id),
-        )
-        if existing:
+        # Cheap early exit before validating
+        if verified_users.is_verified(guild.id, user.id):
             await interaction.followup.send("You are already verified!", ephemeral=True)
             return
 
@@ -213,15 +305,15 @@ class VerifyModal(discord.ui.Modal):
 
         # Fallback: check league ops manual entries
         if not matched:
-            lops_row = await Database.fetchone(
-                "SELECT ign FROM lops_entries WHERE guild_id = %s AND uid = %s AND server = %s",
+            lops_ign = await Database.fetchval(
+                SQL_LOOKUP_LOPS,
                 (guild.id, uid_raw, server_raw),
             )
-            if lops_row:
+            if lops_ign is not None:
                 matched = {
                     "team_name": "League Operations",
                     "abbrev": "LOps",
-                    "ign": lops_row["ign"],
+                    "ign": lops_ign,
                     "role": "league ops",
                     "uid": uid_raw,
                     "server": server_raw,
@@ -241,43 +333,48 @@ class VerifyModal(discord.ui.Modal):
         team_name = matched.get("team_name", "Unknown").strip()
         abbrev = matched.get("abbrev", "").strip()
         ign = matched.get("ign", "").strip()
-        role_key = matched.get("role", "").strip().lower()
+        role_key = matched.get("role") or ""  # Already lowercase at the source
 
-        # Insert into DB
-        await Database.execute(
-            "INSERT INTO verified_users (guild_id, discord_id, team_name, game_uid, server) "
-            "VALUES (%s, %s, %s, %s, %s)",
-            (guild.id, user.id, team_name, uid_raw, server_raw),
-        )
+        # Claim the user before the first await so a concurrent double submit
+        # is rejected above
+        if verified_users.is_verified(guild.id, user.id):
+            await interaction.followup.send("You are already verified!", ephemeral=True)
+            return
+        verified_users.add(guild.id, user.id, team_name)
+        try:
+            # UNIQUE(guild_id, discord_id) still rejects rows added outside the bot
+            inserted = await Database.execute(
+                SQL_INSERT_VERIFIED, (guild.id, user.id, team_name, uid_raw, server_raw),
+            )
+        except Exception:
+            verified_users.remove(guild.id, (user.id,))
+            raise
+        if not inserted:
+            # Row made outside the bot: verified, but its team isn't the one we claimed
+            verified_users.add(guild.id, user.id, None)
+            await interaction.followup.send("You are already verified!", ephemeral=True)
+            return
 
-        # Assign role based on sheet data
+        # Role based on sheet data
+        roles = []
         role_id = VERIFICATION_ROLES.get(role_key)
         assigned_role_name = role_key.title() if role_key else "Verified"
         if role_id:
             role = guild.get_role(role_id)
             if role:
-                try:
-                    await user.add_roles(role, reason=f"Verification: {role_key}")
-                except discord.Forbidden:
-                    pass
+                roles.append(role)
 
-        # Also assign fallback role if configured
-        fallback_role_id_str = await Database.get_config(guild.id, "verification_role_id")
-        if fallback_role_id_str:
-            fallback_role = guild.get_role(int(fallback_role_id_str))
-            if fallback_role:
-                try:
-                    await user.add_roles(fallback_role, reason="Verification completed")
-                except discord.Forbidden:
-                    pass
+        # Also the fallback role if configured
+        if not roles or VERIFICATION_ALWAYS_FALLBACK:
+            fallback_role_id_str = await Database.get_config(guild.id, "verification_role_id")
+            if fallback_role_id_str:
+                fallback_role = guild.get_role(int(fallback_role_id_str))
+                if fallback_role and fallback_role not in roles:
+                    roles.append(fallback_role)
 
-        # Set nickname to ABBREV | IGN
-        if abbrev and ign:
-            new_nick = f"{abbrev} | {ign}"
-            try:
-                await user.edit(nick=new_nick, reason="Verification nickname")
-            except discord.Forbidden:
-                pass  # Bot may not be able to change owner's nick
+        # Assign roles and set nickname to ABBREV | IGN in one call
+        new_nick = f"{abbrev} | {ign}" if abbrev and ign else None
+        await _apply_verification(user, roles, new_nick, reason=f"Verification: {role_key}")
 
         # Respond in channel
         await interaction.followup.send(
@@ -288,25 +385,23 @@ class VerifyModal(discord.ui.Modal):
         )
 
         # Send DM with confirmation and instructions
-        try:
-            dm_embed = discord.Embed(
-                title="Verification Confirmed",
-                description=(
-                    f"You have been verified and assigned the **{assigned_role_name}** role "
-                    f"under **{team_name}**.\n\n"
-                    f"Please wait for a Marshal to mention you in your designated match thread "
-                    f"in <#{MATCH_CHANNEL_ID}> on tournament day.\n\n"
-                    f"Good luck and have fun!"
-                ),
-                color=0x00CC66,
-            )
-            dm_embed.add_field(name="Team", value=team_name, inline=True)
-            dm_embed.add_field(name="Role", value=assigned_role_name, inline=True)
-            if abbrev and ign:
-                dm_embed.add_field(name="Nickname", value=f"{abbrev} | {ign}", inline=True)
-            await user.send(embed=dm_embed)
-        except discord.Forbidden:
-            pass  # DMs disabled
+        dm_embed = discord.Embed(
+            title="Verification Confirmed",
+            description=(
+                f"You have been verified and assigned the **{assigned_role_name}** role "
+                f"under **{team_name}**.\n\n"
+                f"Please wait for a Marshal to mention you in your designated match thread "
+                f"in <#{MATCH_CHANNEL_ID}> on tournament day.\n\n"
+                f"Good luck and have fun!"
+            ),
+            color=0x00CC66,
+        )
+        dm_embed.add_field(name="Team", value=team_name, inline=True)
+        dm_embed.add_field(name="Role", value=assigned_role_name, inline=True)
+        if abbrev and ign:
+            dm_embed.add_field(name="Nickname", value=f"{abbrev} | {ign}", inline=True)
+        # Sent in the background so the handler isn't held up by the DM round trip
+        _spawn(_send_dm(user, embed=dm_embed))
 
 
 # -- Staff / Coach verification modal ----------------------------------------
@@ -362,12 +457,8 @@ class StaffCodeModal(discord.ui.Modal):
             )
             return
 
-        # Race condition guard
-        existing = await Database.fetchone(
-            "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s",
-            (guild.id, user.id),
-        )
-        if existing:
+        # Cheap early exit before matching the team
+        if verified_users.is_verified(guild.id, user.id):
             await interaction.followup.send("You are already verified!", ephemeral=True)
             return
 
@@ -427,40 +518,45 @@ class StaffCodeModal(discord.ui.Modal):
             )
             return
 
-        # Insert into DB with staff_type
-        await Database.execute(
-            "INSERT INTO verified_users (guild_id, discord_id, team_name, game_uid, server, staff_type) "
-            "VALUES (%s, %s, %s, %s, %s, %s)",
-            (guild.id, user.id, matched_team, "STAFF", "0", self.staff_type),
-        )
+        # Insert into DB with staff_type -- claimed in the cache first so a
+        # concurrent submit is rejected; the unique key catches the rest
+        if verified_users.is_verified(guild.id, user.id):
+            await interaction.followup.send("You are already verified!", ephemeral=True)
+            return
+        verified_users.add(guild.id, user.id, matched_team)
+        try:
+            inserted = await Database.execute(
+                SQL_INSERT_VERIFIED_STAFF,
+                (guild.id, user.id, matched_team, "STAFF", "0", self.staff_type),
+            )
+        except Exception:
+            verified_users.remove(guild.id, (user.id,))
+            raise
+        if not inserted:
+            # Row made outside the bot: verified, but its team isn't the one we claimed
+            verified_users.add(guild.id, user.id, None)
+            await interaction.followup.send("You are already verified!", ephemeral=True)
+            return
 
-        # Assign Staff role (1471152576366907534)
+        # Staff role (1471152576366907534)
+        roles = []
         staff_role_id = VERIFICATION_ROLES.get("staff")
         if staff_role_id:
             role = guild.get_role(staff_role_id)
             if role:
-                try:
-                    await user.add_roles(role, reason=f"Staff verification: {role_input}")
-                except discord.Forbidden:
-                    pass
+                roles.append(role)
 
-        # Also assign fallback role if configured
-        fallback_role_id_str = await Database.get_config(guild.id, "verification_role_id")
-        if fallback_role_id_str:
-            fallback_role = guild.get_role(int(fallback_role_id_str))
-            if fallback_role:
-                try:
-                    await user.add_roles(fallback_role, reason="Staff verification completed")
-                except discord.Forbidden:
-                    pass
+        # Also the fallback role if configured
+        if not roles or VERIFICATION_ALWAYS_FALLBACK:
+            fallback_role_id_str = await Database.get_config(guild.id, "verification_role_id")
+            if fallback_role_id_str:
+                fallback_role = guild.get_role(int(fallback_role_id_str))
+                if fallback_role and fallback_role not in roles:
+                    roles.append(fallback_role)
 
-        # Set nickname to ABBREV | IGN
-        if abbrev and ign:
-            new_nick = f"{abbrev} | {ign}"
-            try:
-                await user.edit(nick=new_nick, reason=f"Staff verification ({role_input})")
-            except discord.Forbidden:
-                pass
+        # Assign roles and set nickname to ABBREV | IGN in one call
+        new_nick = f"{abbrev} | {ign}" if abbrev and ign else None
+        await _apply_verification(user, roles, new_nick, reason=f"Staff verification ({role_input})")
 
         role_display = role_input.title()  # "Coach" or "Manager"
 
@@ -470,25 +566,22 @@ class StaffCodeModal(discord.ui.Modal):
             ephemeral=True,
         )
 
-        # Send DM
-        try:
-            dm_embed = discord.Embed(
-                title="Staff Verification Confirmed",
-                description=(
-                    f"You have been verified as **{role_display}** for **{matched_team}**.\n\n"
-                    f"Please wait for a Marshal to mention you in your designated match thread "
-                    f"in <#{MATCH_CHANNEL_ID}> on tournament day.\n\n"
-                    f"Good luck and have fun!"
-                ),
-                color=0x00CC66,
-            )
-            dm_embed.add_field(name="Team", value=matched_team, inline=True)
-            dm_embed.add_field(name="Role", value=role_display, inline=True)
-            if abbrev and ign:
-                dm_embed.add_field(name="Nickname", value=f"{abbrev} | {ign}", inline=True)
-            await user.send(embed=dm_embed)
-        except discord.Forbidden:
-            pass  # DMs disabled
+        # Send DM (in the background)
+        dm_embed = discord.Embed(
+            title="Staff Verification Confirmed",
+            description=(
+                f"You have been verified as **{role_display}** for **{matched_team}**.\n\n"
+                f"Please wait for a Marshal to mention you in your designated match thread "
+                f"in <#{MATCH_CHANNEL_ID}> on tournament day.\n\n"
+                f"Good luck and have fun!"
+            ),
+            color=0x00CC66,
+        )
+        dm_embed.add_field(name="Team", value=matched_team, inline=True)
+        dm_embed.add_field(name="Role", value=role_display, inline=True)
+        if abbrev and ign:
+            dm_embed.add_field(name="Nickname", value=f"{abbrev} | {ign}", inline=True)
+        _spawn(_send_dm(user, embed=dm_embed))
 
 
 # -- Cog ---------------------------------------------------------------------
@@ -497,14 +590,47 @@ class Verification(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    # Passphrase config is read on every message; Database caches it after
+    # the first read (misses included), so these never wait on the DB again.
+
+    async def _get_oppo_passphrase(self, guild_id: int) -> str:
+        """Return the guild's OPPO passphrase."""
+        return await Database.get_config(guild_id, "oppo_passphrase") or "!OPPOteam"
+
+    async def _get_prod_passphrase(self, guild_id: int) -> tuple[str, str]:
+        """Return the guild's (production passphrase, role ID); "" when unset."""
+        cfg = await Database.get_configs(guild_id, ["production_passphrase", "production_role_id"])
+        return cfg.get("production_passphrase", ""), cfg.get("production_role_id", "")
+
+    async def _get_passphrase_channel(self, guild_id: int) -> int:
+        """Return the guild's passphrase channel ID (0 = unrestricted)."""
+        return int(await Database.get_config(guild_id, "passphrase_channel_id") or 0)
+
     async def cog_load(self):
-        self.bot.add_view(VerifyButtonView())
+        # One stateless persistent view, shared by the registry and every panel
+        self._panel_view = VerifyButtonView()
+        self.bot.add_view(self._panel_view)
+
+        # Independent startup reads, run concurrently on separate pool connections:
+        # verified users, the fallback role for all guilds (read on every
+        # verification) and the global sheet config (guild_id=0)
+        rows, _, cfg = await asyncio.gather(
+            Database.fetchall("SELECT guild_id, discord_id, team_name FROM verified_users"),
+            Database.prime_config("verification_role_id"),
+            Database.get_configs(0, [
+                "verification_sheet_id",
+                "verification_sheet_gid",
+                "verification_sheet_tab",
+                "verification_test_mode",
+            ]),
+        )
 
-        # Load sheet config from DB if previously set (guild_id=0 for global)
-        sheet_id = await Database.get_config(0, "verification_sheet_id")
-        sheet_gid = await Database.get_config(0, "verification_sheet_gid") or "0"
-        sheet_tab = await Database.get_config(0, "verification_sheet_tab")
-        test_mode = await Database.get_config(0, "verification_test_mode")
+        verified_users.load(rows)
+
+        sheet_id = cfg.get("verification_sheet_id")
+        sheet_gid = cfg.get("verification_sheet_gid") or "0"
+        sheet_tab = cfg.get("verification_sheet_tab")
+        test_mode = cfg.get("verification_test_mode")
 
         if sheet_id:
             validator.configure_sheet(sheet_id, sheet_gid, tab_name=sheet_tab)
@@ -518,6 +644,11 @@ class Verification(commands.Cog):
         elif sheet_id:
             validator.disable_test_mode()
 
+        validator.start_auto_refresh()
+
+    async def cog_unload(self):
+        await validator.close()
+
     # -- Admin: send panel ---------------------------------------------------
 
     @app_commands.command(
@@ -543,7 +674,7 @@ class Verification(commands.Cog):
         if guide_url:
             embed.set_image(url=guide_url)
 
-        await channel.send(embed=embed, view=VerifyButtonView())
+        await channel.send(embed=embed, view=self._panel_view)
         await interaction.response.send_message(
             f"Verification panel sent to {channel.mention}.", ephemeral=True
         )
@@ -578,6 +709,7 @@ class Verification(commands.Cog):
         self, interaction: discord.Interaction, image_url: str
     ):
         await Database.set_config(interaction.guild_id, "verification_guide_image", image_url)
+        _guide_embeds.clear()
 
         preview = discord.Embed(title="Guide Image Preview", color=0xF2C21A)
         preview.set_image(url=image_url)
@@ -606,10 +738,12 @@ class Verification(commands.Cog):
 
         sheet_id = validator.configure_sheet(url, gid, tab_name=tab_name)
 
-        await Database.set_config(0, "verification_sheet_id", sheet_id)
-        await Database.set_config(0, "verification_sheet_gid", gid)
-        await Database.set_config(0, "verification_sheet_tab", tab_name)
-        await Database.set_config(0, "verification_test_mode", "0")
+        await Database.set_config_many(0, {
+            "verification_sheet_id": sheet_id,
+            "verification_sheet_gid": gid,
+            "verification_sheet_tab": tab_name,
+            "verification_test_mode": "0",
+        })
 
         try:
             count = await validator.refresh()
@@ -722,9 +856,13 @@ class Verification(commands.Cog):
     @app_commands.default_permissions(administrator=True)
     @app_commands.describe(passphrase="The passphrase users type to get the OPPO role (e.g. !OPPOteam)")
     async def set_oppo_passphrase(
-        self, interaction: discord.Interaction, passphrase: str
+        self, interaction: discord.Interaction,
+        passphrase: app_commands.Range[str, 1, PASSPHRASE_MAX_LENGTH],
     ):
         clean = passphrase.strip()
+        if not clean:
+            await interaction.response.send_message("❌ The passphrase cannot be blank.", ephemeral=True)
+            return
         await Database.set_config(interaction.guild_id, "oppo_passphrase", clean)
         await interaction.response.send_message(
             f"OPPO passphrase set. Users who type `{clean}` will receive the OPPO role "
@@ -744,17 +882,42 @@ class Verification(commands.Cog):
         role="The role to assign when the passphrase is used",
     )
     async def set_production_passphrase(
-        self, interaction: discord.Interaction, passphrase: str, role: discord.Role
+        self, interaction: discord.Interaction,
+        passphrase: app_commands.Range[str, 1, PASSPHRASE_MAX_LENGTH], role: discord.Role,
     ):
         clean = passphrase.strip()
-        await Database.set_config(interaction.guild_id, "production_passphrase", clean)
-        await Database.set_config(interaction.guild_id, "production_role_id", str(role.id))
+        if not clean:
+            await interaction.response.send_message("❌ The passphrase cannot be blank.", ephemeral=True)
+            return
+        await Database.set_config_many(interaction.guild_id, {
+            "production_passphrase": clean,
+            "production_role_id": str(role.id),
+        })
         await interaction.response.send_message(
             f"Production passphrase set. Users who type `{clean}` will receive {role.mention} "
             "and their message will be deleted instantly.",
             ephemeral=True,
         )
 
+    # -- Admin: restrict passphrase channel ----------------------------------
+
+    @app_commands.command(
+        name="set_passphrase_channel",
+        description="Only accept OPPO/production passphrases in one channel.",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(channel="Channel to accept passphrases in (leave empty to allow any channel)")
+    async def set_passphrase_channel(
+        self, interaction: discord.Interaction, channel: discord.TextChannel | None = None
+    ):
+        channel_id = channel.id if channel else 0
+        await Database.set_config(interaction.guild_id, "passphrase_channel_id", str(channel_id))
+        if channel:
+            msg = f"Passphrases will only be accepted in {channel.mention}."
+        else:
+            msg = "Passphrases will be accepted in any channel."
+        await interaction.response.send_message(msg, ephemeral=True)
+
     # -- Admin: set staff access code ----------------------------------------
 
     @app_commands.command(
@@ -798,10 +961,10 @@ class Verification(commands.Cog):
         server = server.strip()
         ign = ign.strip()
 
-        if not uid.isdigit():
+        if not _is_numeric_id(uid):
             await interaction.response.send_message("❌ UID must be numbers only.", ephemeral=True)
             return
-        if not server.isdigit():
+        if not _is_numeric_id(server):
             await interaction.response.send_message("❌ Server must be numbers only.", ephemeral=True)
             return
         if not ign:
@@ -831,6 +994,62 @@ class Verification(commands.Cog):
             ephemeral=True,
         )
 
+    @app_commands.command(
+        name="import_lops",
+        description="Bulk import League Ops entries from a CSV file (uid,server,ign).",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(file="CSV/TSV file with one `uid,server,ign` entry per line")
+    async def import_lops(
+        self, interaction: discord.Interaction, file: discord.Attachment,
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            text = (await file.read()).decode("utf-8-sig")
+        except (discord.HTTPException, UnicodeDecodeError) as e:
+            await interaction.followup.send(f"❌ Could not read file: {e}", ephemeral=True)
+            return
+
+        delimiter = "\t" if "\t" in text.split("\n", 1)[0] else ","
+        rows = []
+        invalid = []
+        for line_no, fields in enumerate(csv.reader(io.StringIO(text), delimiter=delimiter), 1):
+            fields = [f.strip() for f in fields]
+            if not any(fields):
+                continue
+            if len(fields) < 3 or not _is_numeric_id(fields[0]) or not _is_numeric_id(fields[1]) or not fields[2]:
+                # Tolerate a header row
+                if line_no == 1 and fields and fields[0].lower() == "uid":
+                    continue
+                invalid.append(line_no)
+                continue
+            uid, server, ign = fields[:3]
+            rows.append((interaction.guild_id, uid, server, ign, interaction.user.id))
+
+        if not rows:
+            await interaction.followup.send(
+                "❌ No valid entries found. Expected one `uid,server,ign` per line.",
+                ephemeral=True,
+            )
+            return
+
+        # Single multi-row INSERT; existing (uid, server) pairs are skipped
+        added = await Database.executemany(
+            "INSERT IGNORE INTO lops_entries (guild_id, uid, server, ign, added_by) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+        msg = (
+            f"✅ Imported **{added}** League Ops entries.\n"
+            f"**Skipped (duplicates):** {len(rows) - added}"
+        )
+        if invalid:
+            shown = ", ".join(str(n) for n in invalid[:20])
+            msg += f"\n**Invalid lines:** {shown}" + ("..." if len(invalid) > 20 else "")
+        await interaction.followup.send(msg, ephemeral=True)
+
     @app_commands.command(
         name="remove_lops",
         description="Remove a League Ops member entry.",
@@ -936,10 +1155,24 @@ class Verification(commands.Cog):
             )
             return
 
-        mentions = " ".join(f"<@{row['discord_id']}>" for row in rows)
-        await interaction.response.send_message(
-            f"**{team}** — {mentions}"
-        )
+        # Split into messages that stay under Discord's 2000-char limit
+        prefix = f"**{team}** — "
+        chunks = []
+        current = prefix
+        for row in rows:
+            mention = f"<@{row['discord_id']}>"
+            if len(current) + len(mention) + 1 > MENTION_CHUNK_LIMIT and current != prefix:
+                chunks.append(current.rstrip())
+                current = prefix
+            current += mention + " "
+        chunks.append(current.rstrip())
+
+        # Only user pings -- team names must never trigger @everyone / role pings
+        allowed = discord.AllowedMentions(users=True, roles=False, everyone=False)
+        await interaction.response.send_message(chunks[0], allowed_mentions=allowed)
+        # Sent one by one so the mention list arrives in order
+        for chunk in chunks[1:]:
+            await interaction.followup.send(chunk, allowed_mentions=allowed)
 
     # -- Marshal: list verified teams ----------------------------------------
 
@@ -1003,7 +1236,7 @@ class Verification(commands.Cog):
             return
 
         # Merge: all teams from sheet + any extras from DB
-        all_teams = set(sheet_teams.keys()) | set(verified_counts.keys())
+        all_teams = sheet_teams.keys() | verified_counts.keys()
         lines = []
         total_players = 0
         total_verified = 0
@@ -1251,7 +1484,7 @@ class Verification(commands.Cog):
     async def _get_verification_roles(self, guild: discord.Guild) -> list[discord.Role]:
         """Collect all verification role objects for a guild."""
         roles = []
-        for role_id in VERIFICATION_ROLES.values():
+        for role_id in VERIFICATION_ROLE_IDS:
             role = guild.get_role(role_id)
             if role:
                 roles.append(role)
@@ -1267,15 +1500,33 @@ class Verification(commands.Cog):
         self, member: discord.Member, roles_to_remove: list[discord.Role], reason: str
     ) -> bool:
         """Strip verification roles and reset nickname for a single member. Returns True on success."""
+        held = member.roles
+        held_ids = {r.id for r in held}
+        member_roles = [r for r in roles_to_remove if r.id in held_ids]
+        changes = {}
+        if member_roles:
+            remove_ids = {r.id for r in member_roles}
+            changes["roles"] = [
+                r for r in held if not r.is_default() and r.id not in remove_ids
+            ]
+        if member.nick:
+            changes["nick"] = None
+        if not changes:
+            return True
+
+        # Roles and nickname in a single member edit
+        try:
+            await member.edit(reason=reason, **changes)
+            return True
+        except discord.Forbidden:
+            if not member_roles:
+                return True  # Only the nick failed, which is tolerated
+            if "nick" not in changes:
+                return False
+
+        # Nick edits fail for members above the bot -- still strip the roles
         try:
-            member_roles = [r for r in roles_to_remove if r in member.roles]
-            if member_roles:
-                await member.remove_roles(*member_roles, reason=reason)
-            if member.nick:
-                try:
-                    await member.edit(nick=None, reason=reason)
-                except discord.Forbidden:
-                    pass
+            await member.remove_roles(*member_roles, reason=reason)
             return True
         except discord.Forbidden:
             return False
@@ -1311,7 +1562,7 @@ class Verification(commands.Cog):
         # --- Reset a specific user ---
         if user:
             row = await Database.fetchone(
-                "SELECT id FROM verified_users WHERE guild_id = %s AND discord_id = %s",
+                SQL_CHECK_VERIFIED,
                 (guild.id, user.id),
             )
             if not row:
@@ -1325,6 +1576,7 @@ class Verification(commands.Cog):
                 "DELETE FROM verified_users WHERE guild_id = %s AND discord_id = %s",
                 (guild.id, user.id),
             )
+            verified_users.remove(guild.id, (user.id,))
             await interaction.followup.send(
                 f"✅ Verification reset for {user.mention}.\n"
                 "Their roles and nickname have been cleared.",
@@ -1344,17 +1596,23 @@ class Verification(commands.Cog):
                 )
                 return
 
+            await ensure_member_cache(guild)
             cleared = 0
+            get_member = guild.get_member
             for row in rows:
-                member = guild.get_member(row["discord_id"])
+                member = get_member(row["discord_id"])
                 if member:
                     if await self._strip_member_verification(member, roles_to_remove, f"Verification reset ({team})"):
                         cleared += 1
 
+            # Delete exactly the rows fetched above: anyone who verified during
+            # the role loop keeps both their new row and their cache entry
+            member_ids = [row["discord_id"] for row in rows]
             await Database.execute(
-                "DELETE FROM verified_users WHERE guild_id = %s AND team_name = %s",
-                (guild.id, team),
+                "DELETE FROM verified_users WHERE guild_id = %s AND discord_id IN %s",
+                (guild.id, tuple(member_ids)),
             )
+            verified_users.remove(guild.id, member_ids)
             await interaction.followup.send(
                 f"✅ Verification reset for **{team}**.\n"
                 f"**Records deleted:** {len(rows)}\n"
@@ -1380,17 +1638,22 @@ class Verification(commands.Cog):
             (guild.id,),
         )
 
+        await ensure_member_cache(guild)
         cleared = 0
+        get_member = guild.get_member
         for row in rows:
-            member = guild.get_member(row["discord_id"])
+            member = get_member(row["discord_id"])
             if member:
                 if await self._strip_member_verification(member, roles_to_remove, "Verification reset (all)"):
                     cleared += 1
 
-        await Database.execute(
-            "DELETE FROM verified_users WHERE guild_id = %s",
-            (guild.id,),
-        )
+        member_ids = [row["discord_id"] for row in rows]
+        if member_ids:  # Same as the team reset: only the rows fetched above
+            await Database.execute(
+                "DELETE FROM verified_users WHERE guild_id = %s AND discord_id IN %s",
+                (guild.id, tuple(member_ids)),
+            )
+            verified_users.remove(guild.id, member_ids)
 
         await interaction.followup.send(
             f"✅ All verifications have been reset.\n"
@@ -1406,18 +1669,26 @@ class Verification(commands.Cog):
         if message.author.bot or not message.guild:
             return
 
+        # Cheap rejects first -- this runs for every message in the guild
+        if len(message.content) > PASSPHRASE_MAX_LENGTH * 2:
+            return
+        passphrase_channel = await self._get_passphrase_channel(message.guild.id)
+        if passphrase_channel and message.channel.id != passphrase_channel:
+            return
+
+        # str.strip() returns the same object when there is nothing to strip,
+        # and == rejects on length first, so the compares below stay cheap.
         content = message.content.strip()
+        if not content:  # Attachment/sticker-only messages never match a passphrase
+            return
+        author = message.author
 
-        # --- OPPO passphrase ---
-        oppo_passphrase = await Database.get_config(message.guild.id, "oppo_passphrase")
-        if not oppo_passphrase:
-            oppo_passphrase = "!OPPOteam"
+        # Deletes and DMs are non-critical and run in the background;
+        # only the role grant is awaited.
 
-        if content == oppo_passphrase:
-            try:
-                await message.delete()
-            except (discord.Forbidden, discord.NotFound):
-                pass
+        # --- OPPO passphrase ---
+        if content == await self._get_oppo_passphrase(message.guild.id):
+            _spawn(_quietly(message.delete()))
 
             oppo_role_id = VERIFICATION_ROLES.get("oppo")
             if not oppo_role_id:
@@ -1427,39 +1698,24 @@ class Verification(commands.Cog):
             if not role:
                 return
 
-            if role in message.author.roles:
-                try:
-                    await message.author.send("You already have the OPPO role!")
-                except discord.Forbidden:
-                    pass
+            if role in author.roles:
+                _spawn(_send_dm(author, content="You already have the OPPO role!"))
                 return
 
             try:
-                await message.author.add_roles(role, reason="OPPO passphrase verification")
+                await author.add_roles(role, reason="OPPO passphrase verification")
             except discord.Forbidden:
-                try:
-                    await message.author.send("Could not assign the OPPO role (missing permissions).")
-                except discord.Forbidden:
-                    pass
+                _spawn(_send_dm(author, content="Could not assign the OPPO role (missing permissions)."))
                 return
 
-            try:
-                await message.author.send(
-                    "You have been verified as **OPPO** team. Welcome!"
-                )
-            except discord.Forbidden:
-                pass
+            _spawn(_send_dm(author, content="You have been verified as **OPPO** team. Welcome!"))
             return
 
         # --- Production passphrase ---
-        prod_passphrase = await Database.get_config(message.guild.id, "production_passphrase")
+        prod_passphrase, prod_role_id_str = await self._get_prod_passphrase(message.guild.id)
         if prod_passphrase and content == prod_passphrase:
-            try:
-                await message.delete()
-            except (discord.Forbidden, discord.NotFound):
-                pass
+            _spawn(_quietly(message.delete()))
 
-            prod_role_id_str = await Database.get_config(message.guild.id, "production_role_id")
             if not prod_role_id_str:
                 return
 
@@ -1467,28 +1723,20 @@ class Verification(commands.Cog):
             if not role:
                 return
 
-            if role in message.author.roles:
-                try:
-                    await message.author.send("You already have the Production role!")
-                except discord.Forbidden:
-                    pass
+            if role in author.roles:
+                _spawn(_send_dm(author, content="You already have the Production role!"))
                 return
 
             try:
-                await message.author.add_roles(role, reason="Production passphrase verification")
+                await author.add_roles(role, reason="Production passphrase verification")
             except discord.Forbidden:
-                try:
-                    await message.author.send("Could not assign the Production role (missing permissions).")
-                except discord.Forbidden:
-                    pass
+                _spawn(_send_dm(author, content="Could not assign the Production role (missing permissions)."))
                 return
 
-            try:
-                await message.author.send(
-                    f"You have been verified as **Production** team and received the **{role.name}** role. Welcome!"
-                )
-            except discord.Forbidden:
-                pass
+            _spawn(_send_dm(
+                author,
+                content=f"You have been verified as **Production** team and received the **{role.name}** role. Welcome!",
+            ))
             return
 
 
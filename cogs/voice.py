@@ -5,12 +5,37 @@ Cog: Voice — Auto-create voice channels with team-based restrictions
 - on_voice_state_update — create new VC when user joins trigger, delete when empty
 6:                         — clean up when empty
 """
+import asyncio
+
 import discord
 from discord.ext import commands
 from discord import app_commands
 
-from db.database import Database
+from db.database import BatchWriter, Database
 from utils.constants import VERIFICATION_ROLES
+from utils.verified_users import verified_users
+
+
+# Seconds a spawned VC may sit empty before it is deleted (absorbs reconnects)
+EMPTY_VC_GRACE = 10
+
+# Hot voice-path statements, defined once
+SQL_GET_TEAM = "SELECT team_name FROM verified_users WHERE guild_id = %s AND discord_id = %s"
+SQL_INSERT_SPAWNED = (
+    "INSERT INTO spawned_vcs (channel_id, guild_id, owner_id, team_name) VALUES (%s, %s, %s, %s)"
+)
+SQL_DELETE_SPAWNED = "DELETE FROM spawned_vcs WHERE channel_id = %s"
+
+# VCs created together share one multi-row INSERT. Deletes stay single
+# statements: executemany only coalesces INSERTs, so batching them gains nothing.
+_spawned_insert = BatchWriter(SQL_INSERT_SPAWNED, max_batch=32)
+
+# Overwrites applied to every spawned VC. Built once and shared; never mutate.
+_EVERYONE_OVERWRITE = discord.PermissionOverwrite(connect=True)
+_OWNER_OVERWRITE = discord.PermissionOverwrite(
+    connect=True, manage_channels=True,
+    move_members=True, mute_members=True,
+)
 
 
 class Voice(commands.Cog):
@@ -21,6 +46,12 @@ class Voice(commands.Cog):
         self._trigger_channels: set[int] = set()
         # Map spawned channel_id -> team_name (for quick team checks)
         self._spawned_teams: dict[int, str | None] = {}
+        # In-flight background DB writes (strong refs until they finish)
+        self._db_writes: set[asyncio.Task] = set()
+        # Spawned channel_id -> timer that deletes it once the grace period ends
+        self._pending_delete: dict[int, asyncio.TimerHandle] = {}
+        # guild_id -> lock serialising VC creation (absorbs duplicate join events)
+        self._create_locks: dict[int, asyncio.Lock] = {}
 
         self.bot.loop.create_task(self._load_state())
 
@@ -29,28 +60,99 @@ class Voice(commands.Cog):
     def _league_ops_role_id(self) -> int:
         return VERIFICATION_ROLES.get("league ops", 0)
 
+    async def _get_team(self, guild_id: int, member_id: int) -> str | None:
+        """Return the member's verified team name.
+
+        Read from the shared verified_users cache the Verification cog keeps.
+        Unverified members (staff, marshals, ...) never touch the DB; only a
+        cached row without a team (e.g. written outside the bot) is re-read.
+        """
+        if not verified_users.is_verified(guild_id, member_id):
+            return None
+        team = verified_users.get_team(guild_id, member_id)
+        if team is not None:
+            return team
+        return await Database.fetchval(SQL_GET_TEAM, (guild_id, member_id)) or None
+
+    def _write_later(self, write):
+        """Run a DB write coroutine in the background so Discord actions aren't held up."""
+        task = asyncio.create_task(write)
+        self._db_writes.add(task)
+        task.add_done_callback(self._on_write_done)
+
+    def _on_write_done(self, task: asyncio.Task):
+        self._db_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Voice: background DB write failed: {task.exception()}")
+
+    def _schedule_delete(self, vc: discord.VoiceChannel):
+        """Delete an empty spawned VC after EMPTY_VC_GRACE unless someone rejoins."""
+        if vc.id in self._pending_delete:
+            return
+
+        def fire():
+            self._pending_delete.pop(vc.id, None)
+            task = asyncio.create_task(self._finalize_delete(vc))
+            self._db_writes.add(task)
+            task.add_done_callback(self._on_write_done)
+
+        self._pending_delete[vc.id] = asyncio.get_running_loop().call_later(EMPTY_VC_GRACE, fire)
+
+    def _cancel_delete(self, channel_id: int):
+        handle = self._pending_delete.pop(channel_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    async def _finalize_delete(self, vc: discord.VoiceChannel):
+        """Delete the spawned VC if it is still tracked and still empty."""
+        if vc.id not in self._spawned or len(vc.members) > 0:
+            return
+        self._spawned.discard(vc.id)
+        self._spawned_teams.pop(vc.id, None)
+        self._write_later(Database.execute(SQL_DELETE_SPAWNED, (vc.id,)))
+        try:
+            await vc.delete(reason="Auto-created VC is empty")
+        except (discord.NotFound, discord.Forbidden):
+            pass
+
+    def cog_unload(self):
+        for handle in self._pending_delete.values():
+            handle.cancel()
+        self._pending_delete.clear()
+
     async def _load_state(self):
         """Load trigger channels and spawned VCs from DB on startup."""
         await self.bot.wait_until_ready()
 
-        rows = await Database.fetchall("SELECT trigger_channel_id FROM autocreate_vc_config")
-        self._trigger_channels = {r["trigger_channel_id"] for r in rows}
+        # Trigger and spawned channels in one round trip
+        channel_rows = await Database.fetchall(
+            "SELECT 'trigger' AS kind, trigger_channel_id AS channel_id, NULL AS team_name "
+            "FROM autocreate_vc_config "
+            "UNION ALL "
+            "SELECT 'spawned', channel_id, team_name FROM spawned_vcs"
+        )
+        self._trigger_channels = {r["channel_id"] for r in channel_rows if r["kind"] == "trigger"}
+        rows = [r for r in channel_rows if r["kind"] == "spawned"]
 
-        rows = await Database.fetchall("SELECT channel_id, team_name FROM spawned_vcs")
         self._spawned = {r["channel_id"] for r in rows}
         self._spawned_teams = {r["channel_id"]: r.get("team_name") for r in rows}
 
-        # Clean up spawned VCs that no longer exist
-        to_remove = []
-        for cid in list(self._spawned):
-            ch = self.bot.get_channel(cid)
-            if ch is None:
-                to_remove.append(cid)
+        # Clean up spawned VCs that no longer exist (one DELETE for all)
+        to_remove = {cid for cid in self._spawned if self.bot.get_channel(cid) is None}
         if to_remove:
+            self._spawned -= to_remove
             for cid in to_remove:
-                self._spawned.discard(cid)
                 self._spawned_teams.pop(cid, None)
-                await Database.execute("DELETE FROM spawned_vcs WHERE channel_id = %s", (cid,))
+            await Database.execute(
+                "DELETE FROM spawned_vcs WHERE channel_id IN %s", (tuple(to_remove),)
+            )
+
+        # Grace-period timers don't survive a restart: re-arm them for any
+        # tracked VC that emptied while the bot was down
+        for cid in self._spawned:
+            vc = self.bot.get_channel(cid)
+            if vc is not None and len(vc.members) == 0:
+                self._schedule_delete(vc)
 
 
 
@@ -65,6 +167,13 @@ class Voice(commands.Cog):
     async def setup_autocreate_vc(
         self, interaction: discord.Interaction, channel: discord.VoiceChannel
     ):
+        # Trigger set mirrors the table, so a repeat needs no DB write
+        if channel.id in self._trigger_channels:
+            await interaction.response.send_message(
+                f"{channel.mention} is already an auto-create trigger.", ephemeral=True,
+            )
+            return
+
         try:
             await Database.execute(
                 "INSERT IGNORE INTO autocreate_vc_config (guild_id, trigger_channel_id) VALUES (%s, %s)",
@@ -90,6 +199,12 @@ class Voice(commands.Cog):
     async def remove_autocreate_vc(
         self, interaction: discord.Interaction, channel: discord.VoiceChannel
     ):
+        if channel.id not in self._trigger_channels:
+            await interaction.response.send_message(
+                f"{channel.mention} is not an auto-create trigger.", ephemeral=True,
+            )
+            return
+
         await Database.execute(
             "DELETE FROM autocreate_vc_config WHERE guild_id = %s AND trigger_channel_id = %s",
             (interaction.guild_id, channel.id),
@@ -101,76 +216,85 @@ class Voice(commands.Cog):
 
     # ── Voice state listener ───────────────────────────────────
 
-    @commands.Cog.listener()
-    async def on_voice_state_update(
-        self,
-        member: discord.Member,
-        before: discord.VoiceState,
-        after: discord.VoiceState,
-    ):
-        # --- User joined a trigger channel → create new VC ---
-        if (
-            after.channel
-            and after.channel.id in self._trigger_channels
-        ):
-            guild = member.guild
-            category = after.channel.category
+    async def _create_for(self, member: discord.Member, trigger: discord.VoiceChannel):
+        """Create a VC for *member* next to *trigger* and move them into it."""
+        guild = member.guild
+        category = trigger.category
 
-            # Look up the creator's team from verified_users
-            row = await Database.fetchone(
-                "SELECT team_name FROM verified_users WHERE guild_id = %s AND discord_id = %s",
-                (guild.id, member.id),
-            )
-            creator_team = row["team_name"] if row and row.get("team_name") else None
+        # Look up the creator's team while the channel is being created
+        team_lookup = asyncio.create_task(self._get_team(guild.id, member.id))
 
-            # Create a new VC in the same category
+        # Create a new VC in the same category
+        try:
             new_vc = await guild.create_voice_channel(
                 name=f"{member.display_name}'s Channel",
                 category=category,
                 overwrites={
-                    guild.default_role: discord.PermissionOverwrite(connect=True),
-                    member: discord.PermissionOverwrite(
-                        connect=True, manage_channels=True,
-                        move_members=True, mute_members=True,
-                    ),
+                    guild.default_role: _EVERYONE_OVERWRITE,
+                    member: _OWNER_OVERWRITE,
                 },
                 reason=f"Auto-created for {member}",
             )
+        except Exception:
+            team_lookup.cancel()
+            raise
+        self._spawned.add(new_vc.id)
 
-            # Track it (with team name)
-            self._spawned.add(new_vc.id)
-            self._spawned_teams[new_vc.id] = creator_team
-            await Database.execute(
-                "INSERT INTO spawned_vcs (channel_id, guild_id, owner_id, team_name) VALUES (%s, %s, %s, %s)",
-                (new_vc.id, guild.id, member.id, creator_team),
-            )
+        # Move user into the new VC before any bookkeeping
+        try:
+            await member.move_to(new_vc, reason="Auto-create VC")
+        except discord.HTTPException:
+            pass
 
-            # Move user into the new VC
-            try:
-                await member.move_to(new_vc, reason="Auto-create VC")
-            except discord.HTTPException:
-                pass
+        # Track it (with team name)
+        try:
+            creator_team = await team_lookup
+        except Exception as e:
+            print(f"Voice: team lookup failed for {member}: {e}")
+            creator_team = None
+        self._spawned_teams[new_vc.id] = creator_team
+        self._write_later(
+            _spawned_insert.submit((new_vc.id, guild.id, member.id, creator_team)),
+        )
 
-        # --- User left a spawned VC → clean up if empty ---
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self,
+        member: discord.Member,
+        before: discord.VoiceState,
+        after: discord.VoiceState,
+    ):
+        # Fast path: mute/deafen/stream toggles and moves between unrelated
+        # channels are the vast majority of events and need no work here
+        before_id = before.channel.id if before.channel else 0
+        after_id = after.channel.id if after.channel else 0
+        if before_id == after_id:
+            return
         if (
-            before.channel
-            and before.channel.id in self._spawned
-            and (after.channel is None or after.channel.id != before.channel.id)
+            after_id not in self._trigger_channels
+            and after_id not in self._pending_delete
+            and before_id not in self._spawned
         ):
-            # Check if empty (no members left) → delete
+            return
+
+        # --- User (re)joined a spawned VC pending deletion → keep it ---
+        if after_id in self._pending_delete:
+            self._cancel_delete(after_id)
+
+        # --- User joined a trigger channel → create new VC ---
+        if after_id in self._trigger_channels:
+            lock = self._create_locks.setdefault(member.guild.id, asyncio.Lock())
+            async with lock:
+                # Re-check: a queued duplicate event may be stale by now
+                if member.voice and member.voice.channel and member.voice.channel.id == after_id:
+                    await self._create_for(member, after.channel)
+
+        # --- User left a spawned VC → clean up if empty ---
+        if before_id in self._spawned:
+            # Empty (no members left) → delete after a short grace period
             vc = before.channel
             if len(vc.members) == 0:
-                self._spawned.discard(vc.id)
-                self._spawned_teams.pop(vc.id, None)
-                await Database.execute(
-                    "DELETE FROM spawned_vcs WHERE channel_id = %s", (vc.id,)
-                )
-                try:
-                    await vc.delete(reason="Auto-created VC is empty")
-                except discord.NotFound:
-                    pass
-                except discord.Forbidden:
-                    pass
+                self._schedule_delete(vc)
 
 
 async def setup(bot: commands.Bot):
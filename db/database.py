@@ -5,17 +5,69 @@ import aiomysql
 import os
 import json
 import asyncio
+import contextlib
+import contextvars
 import pathlib
+import re
+
+# Guild-config statements (hit on most interactions)
+SQL_GET_CONFIG = (
+    "SELECT config_value FROM guild_config WHERE guild_id = %s AND config_key = %s"
+)
+SQL_SET_CONFIG = (
+    "INSERT INTO guild_config (guild_id, config_key, config_value) "
+    "VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE config_value = VALUES(config_value)"
+)
+
+# schema.sql split into statements once at import
+_SCHEMA_PATH = pathlib.Path(__file__).parent / "schema.sql"
+SCHEMA_STATEMENTS: tuple[str, ...] = (
+    tuple(s.strip() for s in _SCHEMA_PATH.read_text(encoding="utf-8").split(";") if s.strip())
+    if _SCHEMA_PATH.exists() else ()
+)
+# Pool tuning (see README: DB_POOL_MIN / DB_POOL_MAX / DB_POOL_RECYCLE / DB_*_TIMEOUT)
+POOL_MIN = int(os.getenv("DB_POOL_MIN", 5))
+POOL_MAX = int(os.getenv("DB_POOL_MAX", 25))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 300))
+CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 10))
+ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", 0))  # 0 = queue until free
+
+# Connection of the transaction the current task is inside (see Database.transaction).
+# Held in a one-slot list that is emptied when the transaction ends: tasks
+# spawned inside the block copy this context, and must not keep using a
+# connection that has gone back to the pool.
+_txn_conn: contextvars.ContextVar["list | None"] = contextvars.ContextVar(
+    "_txn_conn", default=None
+)
+
+
+def _current_txn_conn() -> "aiomysql.Connection | None":
+    slot = _txn_conn.get()
+    return slot[0] if slot else None
+
+_CREATE_TABLE_RE = re.compile(r"CREATE\s+TABLE\s+IF\s+NOT\s+EXISTS\s+`?(\w+)`?", re.IGNORECASE)
 
 
 class Database:
     """Manages an aiomysql connection pool with convenience helpers."""
 
     _pool: aiomysql.Pool | None = None
+    # Schema/migrations only need to run once per process, not per pool
+    _schema_applied: bool = False
+    # (guild_id, config_key) -> value (None = known missing). All guild_config
+    # writes go through set_config, which keeps this in sync.
+    _config_cache: dict[tuple[int, str], str | None] = {}
+    # (guild_id, config_key) -> write count. A read that awaited the DB only
+    # caches its result if no write to the key landed in the meantime.
+    _config_versions: dict[tuple[int, str], int] = {}
 
     @classmethod
     async def create_pool(cls) -> None:
-        """Initialise the connection pool from environment variables."""
+        """Initialise the connection pool from environment variables.
+
+        Called once from setup_hook; every cog shares this pool. Repeat calls
+        are no-ops while the pool is open.
+        """
         if cls._pool is not None:
             return
         cls._pool = await aiomysql.create_pool(
@@ -26,33 +78,44 @@ class Database:
             db=os.getenv("DB_NAME", "oppo_hlc_bot"),
             charset="utf8mb4",
             autocommit=True,
-            minsize=2,
-            maxsize=10,
-            pool_recycle=300,  # Reconnect idle connections every 5 min
+            # Sized for bursts of concurrent handlers (mass verify, VC join raids)
+            minsize=POOL_MIN,
+            maxsize=POOL_MAX,
+            connect_timeout=CONNECT_TIMEOUT,
+            pool_recycle=POOL_RECYCLE,  # Reconnect idle connections (default 5 min)
         )
-        await cls._run_schema()
-        await cls._run_migrations()
+        if not cls._schema_applied:
+            await cls._run_schema()
+            await cls._run_migrations()
+            cls._schema_applied = True
 
     @classmethod
     async def _run_schema(cls) -> None:
         """Auto-create tables from db/schema.sql if they don't exist."""
-        schema_path = pathlib.Path(__file__).parent / "schema.sql"
-        if not schema_path.exists():
+        if not SCHEMA_STATEMENTS:
             print("   schema.sql not found, skipping auto-migration.")
             return
-        sql = schema_path.read_text(encoding="utf-8")
-        # Split on semicolons, run each statement
-        statements = [s.strip() for s in sql.split(";") if s.strip()]
         async with cls._pool.acquire() as conn:
             async with conn.cursor() as cur:
-                for stmt in statements:
-                    if not stmt:
+                # Skip CREATE TABLEs for tables that are already there
+                await cur.execute(
+                    "SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()"
+                )
+                existing = {row[0] for row in await cur.fetchall()}
+                applied = 0
+                for stmt in SCHEMA_STATEMENTS:
+                    match = _CREATE_TABLE_RE.search(stmt)
+                    if match and match.group(1) in existing:
                         continue
                     try:
                         await cur.execute(stmt)
+                        applied += 1
                     except Exception as e:
                         print(f"   Schema statement warning: {e}")
-        print("   Auto-migration complete (schema.sql applied).")
+        if applied:
+            print(f"   Auto-migration complete ({applied} schema statement(s) applied).")
+        else:
+            print("   Schema up to date.")
 
     @classmethod
     async def _run_migrations(cls) -> None:
@@ -94,57 +157,134 @@ class Database:
     # Low-level helpers
     # ------------------------------------------------------------------
 
+    @classmethod
+    async def _get_conn(cls) -> aiomysql.Connection:
+        """Borrow a pooled connection.
+
+        With DB_ACQUIRE_TIMEOUT set, give up loudly once it passes. The acquire
+        itself is shielded, so a connection handed over after we gave up (or
+        were cancelled) goes straight back to the pool instead of leaking.
+        """
+        if not ACQUIRE_TIMEOUT:
+            return await cls._pool.acquire()
+        acquire = asyncio.ensure_future(cls._pool.acquire())
+        try:
+            return await asyncio.wait_for(asyncio.shield(acquire), ACQUIRE_TIMEOUT)
+        except BaseException as e:
+            if acquire.done():
+                cls._release_abandoned(acquire)
+            else:
+                acquire.add_done_callback(cls._release_abandoned)
+            if isinstance(e, asyncio.TimeoutError):
+                print(
+                    f"❌ DB pool exhausted: no connection within {ACQUIRE_TIMEOUT}s "
+                    f"(size={cls._pool.size}, max={cls._pool.maxsize})"
+                )
+            raise
+
+    @classmethod
+    def _release_abandoned(cls, acquire: asyncio.Future) -> None:
+        """Return a connection nobody is waiting for any more to the pool."""
+        if not acquire.cancelled() and acquire.exception() is None:
+            cls._pool.release(acquire.result())
+
+    @classmethod
+    async def _run(
+        cls,
+        query: str,
+        args=(),
+        *,
+        fetch: str | None = None,
+        dict_cursor: bool = False,
+        many: bool = False,
+    ):
+        """Run one statement on a pooled connection; the public helpers wrap this.
+
+        *fetch* picks the result: ``"one"``, ``"all"``, ``"lastrowid"`` or
+        None for the affected row count. Inside ``transaction()`` the
+        statement joins the transaction's connection.
+        """
+        txn = _current_txn_conn()
+        conn = txn if txn is not None else await cls._get_conn()
+        try:
+            cur = await (conn.cursor(aiomysql.DictCursor) if dict_cursor else conn.cursor())
+            try:
+                if many:
+                    await cur.executemany(query, args)
+                else:
+                    await cur.execute(query, args)
+                if fetch == "one":
+                    return await cur.fetchone()
+                if fetch == "all":
+                    return await cur.fetchall()
+                if fetch == "lastrowid":
+                    return cur.lastrowid
+                return cur.rowcount
+            finally:
+                await cur.close()
+        finally:
+            if txn is None:
+                cls._pool.release(conn)
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def transaction(cls):
+        """Run every Database helper awaited inside the block as one transaction.
+
+        The pool is autocommit, so related writes otherwise commit one by
+        one; this commits them together (or rolls all back on error). Spawn
+        DB-using background tasks after the block, not inside it.
+        """
+        if _current_txn_conn() is not None:
+            yield  # Already in a transaction: join it
+            return
+        conn = await cls._get_conn()
+        slot = [conn]
+        token = _txn_conn.set(slot)
+        try:
+            await conn.begin()
+            yield
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            slot[0] = None  # Detach any task that copied this context
+            _txn_conn.reset(token)
+            cls._pool.release(conn)
+
     @classmethod
     async def execute(cls, query: str, args: tuple = ()) -> int:
         """Execute a write query (INSERT / UPDATE / DELETE).
         Returns the number of affected rows.
         """
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, args)
-                return cur.rowcount
+        return await cls._run(query, args)
 
     @classmethod
     async def insert_get_id(cls, query: str, args: tuple = ()) -> int:
         """Execute an INSERT query and return the new auto-increment ID."""
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, args)
-                return cur.lastrowid
-
+        return await cls._run(query, args, fetch="lastrowid")
 
     @classmethod
     async def fetchone(cls, query: str, args: tuple = ()) -> dict | None:
         """Fetch a single row as a dict."""
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(query, args)
-                return await cur.fetchone()
+        return await cls._run(query, args, fetch="one", dict_cursor=True)
 
     @classmethod
     async def fetchall(cls, query: str, args: tuple = ()) -> list[dict]:
         """Fetch all rows as a list of dicts."""
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(query, args)
-                return await cur.fetchall()
+        return await cls._run(query, args, fetch="all", dict_cursor=True)
 
     @classmethod
     async def fetchval(cls, query: str, args: tuple = ()):
         """Fetch the first column of the first row (scalar value)."""
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, args)
-                row = await cur.fetchone()
-                return row[0] if row else None
+        row = await cls._run(query, args, fetch="one")
+        return row[0] if row else None
 
     @classmethod
     async def executemany(cls, query: str, args_list: list[tuple]) -> int:
         """Execute the same query with multiple arg sets (bulk insert)."""
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.executemany(query, args_list)
-                return cur.rowcount
+        return await cls._run(query, args_list, many=True)
 
     # ------------------------------------------------------------------
     # Convenience: guild config
@@ -152,19 +292,80 @@ class Database:
 
     @classmethod
     async def get_config(cls, guild_id: int, key: str) -> str | None:
-        row = await cls.fetchone(
-            "SELECT config_value FROM guild_config WHERE guild_id = %s AND config_key = %s",
-            (guild_id, key),
+        """Return a config value, hitting the DB only on first read."""
+        cache_key = (guild_id, key)
+        if cache_key in cls._config_cache:
+            return cls._config_cache[cache_key]
+        version = cls._config_versions.get(cache_key, 0)
+        row = await cls.fetchone(SQL_GET_CONFIG, (guild_id, key))
+        value = row["config_value"] if row else None
+        if cls._config_versions.get(cache_key, 0) != version:
+            return cls._config_cache[cache_key]  # set_config won the race
+        cls._config_cache[cache_key] = value
+        return value
+
+    @classmethod
+    async def get_configs(cls, guild_id: int, keys: list[str]) -> dict[str, str]:
+        """Fetch several config keys in one query. Missing keys are omitted."""
+        missing = [k for k in keys if (guild_id, k) not in cls._config_cache]
+        if missing:
+            versions = {k: cls._config_versions.get((guild_id, k), 0) for k in missing}
+            placeholders = ", ".join(["%s"] * len(missing))
+            rows = await cls.fetchall(
+                "SELECT config_key, config_value FROM guild_config "
+                f"WHERE guild_id = %s AND config_key IN ({placeholders})",
+                (guild_id, *missing),
+            )
+            found = {row["config_key"]: row["config_value"] for row in rows}
+            for k in missing:
+                if cls._config_versions.get((guild_id, k), 0) == versions[k]:
+                    cls._config_cache[(guild_id, k)] = found.get(k)
+
+        result = {}
+        for k in keys:
+            value = cls._config_cache[(guild_id, k)]
+            if value is not None:
+                result[k] = value
+        return result
+
+    @classmethod
+    async def prime_config(cls, key: str) -> None:
+        """Load one config key for every guild into the cache in one query."""
+        rows = await cls.fetchall(
+            "SELECT guild_id, config_value FROM guild_config WHERE config_key = %s",
+            (key,),
         )
-        return row["config_value"] if row else None
+        for row in rows:
+            cache_key = (row["guild_id"], key)
+            if cache_key not in cls._config_versions:  # Never written this run
+                cls._config_cache[cache_key] = row["config_value"]
 
     @classmethod
     async def set_config(cls, guild_id: int, key: str, value: str) -> None:
+        await cls.execute(SQL_SET_CONFIG, (guild_id, key, value))
+        cls._store_config(guild_id, key, value)
+
+    @classmethod
+    async def set_config_many(cls, guild_id: int, values: dict[str, str]) -> None:
+        """Upsert several config keys in one multi-row statement (one round trip)."""
+        if not values:
+            return
+        rows = ", ".join(["(%s, %s, %s)"] * len(values))
+        args = tuple(x for key, value in values.items() for x in (guild_id, key, value))
         await cls.execute(
             "INSERT INTO guild_config (guild_id, config_key, config_value) "
-            "VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE config_value = VALUES(config_value)",
-            (guild_id, key, value),
+            f"VALUES {rows} ON DUPLICATE KEY UPDATE config_value = VALUES(config_value)",
+            args,
         )
+        for key, value in values.items():
+            cls._store_config(guild_id, key, value)
+
+    @classmethod
+    def _store_config(cls, guild_id: int, key: str, value: str) -> None:
+        """Cache a value just written, invalidating any read still in flight."""
+        cache_key = (guild_id, key)
+        cls._config_cache[cache_key] = value
+        cls._config_versions[cache_key] = cls._config_versions.get(cache_key, 0) + 1
 
     # ------------------------------------------------------------------
     # Health check
@@ -172,7 +373,8 @@ class Database:
 
     @classmethod
     async def test_connection(cls) -> bool:
-        """Quick connectivity check."""
+        """Quick connectivity check. Reuses the running pool if there is one."""
+        owns_pool = cls._pool is None
         try:
             await cls.create_pool()
             val = await cls.fetchval("SELECT 1")
@@ -182,4 +384,62 @@ class Database:
             print(f"❌ Database connection FAILED: {e}")
             return False
         finally:
-            await cls.close()
+            # Only tear down a pool we opened just for this check
+            if owns_pool:
+                await cls.close()
+
+
+class BatchWriter:
+    """Coalesce concurrent single-row writes into one ``executemany``.
+
+    A row submitted while the writer is idle is written straight away. Rows
+    submitted while that write is in flight queue up and go out together as
+    the next batch (aiomysql rewrites ``INSERT ... VALUES`` into one
+    multi-row statement), at most ``max_batch`` rows at a time. Each caller
+    still awaits its own result.
+    """
+
+    def __init__(self, query: str, max_batch: int | None = None):
+        self._query = query
+        self._max_batch = max_batch
+        self._pending: list[tuple[tuple, asyncio.Future]] = []
+        self._drain_task: asyncio.Task | None = None
+
+    async def submit(self, args: tuple) -> bool:
+        """Queue one row and wait for it to be written.
+
+        Returns False if a row written on its own was ignored (e.g.
+        ``INSERT IGNORE`` hit a duplicate key). A multi-row batch has no
+        per-row counts, so its rows report True; callers that need the
+        outcome of their own row should write it directly.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((args, fut))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+        return await fut
+
+    async def _drain(self) -> None:
+        while self._pending:
+            cut = self._max_batch or len(self._pending)
+            batch, self._pending = self._pending[:cut], self._pending[cut:]
+            await self._write(batch)
+
+    async def _write(self, batch: list[tuple[tuple, asyncio.Future]]) -> None:
+        try:
+            written = await Database.executemany(self._query, [args for args, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # Don't fail every submitter for one bad row: retry each on its own
+                for args, fut in batch:
+                    await self._write([(args, fut)])
+                return
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        result = written > 0 if len(batch) == 1 else True
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_result(result)
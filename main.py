@@ -3,15 +3,38 @@ OPPO HLC Discord Bot — Main Entrypoint
 """
 import os
 import asyncio
-import traceback
+import contextlib
+import logging
+import logging.handlers
+import queue
+import signal
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 from db.database import Database
 
+try:
+    # libuv-backed event loop; not available on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
 load_dotenv()
 
+# -------------------------------------------------------------------
+# Logging — handlers only enqueue; a listener thread does the writes
+# -------------------------------------------------------------------
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+log = logging.getLogger("oppo.main")
+
 TOKEN = os.getenv("DISCORD_TOKEN")
+if not TOKEN:
+    # Exit before setup_hook opens the DB pool and loads every cog for nothing
+    raise SystemExit("DISCORD_TOKEN is not set.")
 PREFIX = os.getenv("COMMAND_PREFIX", "^")
 
 # -------------------------------------------------------------------
@@ -22,10 +45,15 @@ intents.message_content = True
 intents.members = True
 intents.voice_states = True
 
-bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
+# Member lists are fetched per guild on first need (see guild.chunk() call sites)
+# rather than for every guild before the bot reports ready
+bot = commands.Bot(
+    command_prefix=PREFIX, intents=intents, help_command=None,
+    chunk_guilds_at_startup=False,
+)
 
 # -------------------------------------------------------------------
-# Cog list — loaded in order (dependencies first)
+# Cog list — loaded concurrently; cogs only look each other up at runtime
 # -------------------------------------------------------------------
 COGS = [
     "cogs.logging",
@@ -41,23 +69,31 @@ COGS = [
 ]
 
 
+_ready_once = False
+
+
 @bot.event
 async def on_ready():
-    print(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
-    print(f"   Guilds: {len(bot.guilds)}")
+    # on_ready re-fires after reconnects that can't RESUME; only report the first
+    global _ready_once
+    if _ready_once:
+        return
+    _ready_once = True
+    log.info("Logged in as %s (ID: %s) in %d guilds", bot.user, bot.user.id, len(bot.guilds))
 
-    # Sync slash commands
-    try:
-        synced = await bot.tree.sync()
-        print(f"   Synced {len(synced)} slash commands.")
-    except Exception as e:
-        print(f"   Failed to sync commands: {e}")
+
+@bot.command(name="sync")
+@commands.is_owner()
+async def sync_commands(ctx: commands.Context):
+    """Owner-only: re-sync slash commands without restarting the bot."""
+    synced = await bot.tree.sync()
+    await ctx.send(f"Synced {len(synced)} slash commands.")
 
 
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: Exception):
     """Global handler so slash command errors are never silently dropped."""
-    traceback.print_exception(type(error), error, error.__traceback__)
+    log.error("Slash command error", exc_info=error)
     try:
         if interaction.response.is_done():
             await interaction.followup.send(
@@ -73,30 +109,74 @@ async def on_app_command_error(interaction: discord.Interaction, error: Exceptio
 
 async def setup_hook():
     """Called before the bot connects — initialise DB and load cogs."""
+    # Run new tasks eagerly up to their first await (Python 3.12+); fire-and-
+    # forget sends and cache hits then finish without a loop round-trip
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     # Database pool
     await Database.create_pool()
-    print("✅ Database pool initialised.")
+    log.info("Database pool initialised.")
+
+    # Load cogs — their cog_load DB queries overlap instead of running back to back
+    results = await asyncio.gather(
+        *(bot.load_extension(cog) for cog in COGS), return_exceptions=True
+    )
+    for cog, result in zip(COGS, results):
+        if isinstance(result, Exception):
+            log.error("Failed to load %s: %s", cog, result)
+        else:
+            log.info("Loaded %s", cog)
 
-    # Load cogs
-    for cog in COGS:
-        try:
-            await bot.load_extension(cog)
-            print(f"   ✅ Loaded {cog}")
-        except Exception as e:
-            print(f"   ❌ Failed to load {cog}: {e}")
+    # Sync slash commands once per process — on_ready fires again on every reconnect
+    try:
+        synced = await bot.tree.sync()
+        log.info("Synced %d slash commands.", len(synced))
+    except Exception as e:
+        log.error("Failed to sync commands: %s", e)
 
 
 bot.setup_hook = setup_hook
 
 
+# Seconds leftover cog tasks (queued DB writes, sends) get to finish on shutdown
+SHUTDOWN_GRACE = 5
+
+
+async def _drain_tasks():
+    """Let stray background tasks finish, then cancel whatever is still running."""
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    if not pending:
+        return
+    _, still_running = await asyncio.wait(pending, timeout=SHUTDOWN_GRACE)
+    for task in still_running:
+        task.cancel()
+    await asyncio.gather(*still_running, return_exceptions=True)
+
+
 async def main():
-    async with bot:
-        try:
+    # docker stop / systemd send SIGTERM: close the bot cleanly instead of dying mid-write
+    with contextlib.suppress(NotImplementedError):  # Not supported on Windows
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, lambda: asyncio.ensure_future(bot.close())
+        )
+    try:
+        # Leaving the block closes the bot, which unloads cogs (cancelling their loops)
+        async with bot:
             await bot.start(TOKEN)
-        finally:
-            await Database.close()
-            print("🔌 Database pool closed.")
+    finally:
+        # Nothing may still be using the pool when it closes
+        await _drain_tasks()
+        await Database.close()
+        log.info("Database pool closed.")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    _log_listener.start()
+    try:
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    finally:
+        _log_listener.stop()
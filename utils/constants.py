@@ -4,6 +4,7 @@ All channel / role IDs are read from environment or set here as defaults.
 Update these to match your Discord server.
 """
 import os
+from types import MappingProxyType
 
 # -------------------------------------------------------------------
 # Channel IDs  (update to match your server)
@@ -25,12 +26,17 @@ ROLE_MARSHAL = int(os.getenv("ROLE_MARSHAL", "0"))
 # -------------------------------------------------------------------
 # Verification role mapping  (sheet "role" column -> Discord role ID)
 # -------------------------------------------------------------------
-VERIFICATION_ROLES = {
+VERIFICATION_ROLES = MappingProxyType({
     "player": int(os.getenv("ROLE_PLAYER", "1471152526081654854")),
     "staff": int(os.getenv("ROLE_STAFF", "1471152576366907534")),
     "league ops": int(os.getenv("ROLE_LEAGUE_OPS_VERIFY", "1471151717486956586")),
     "oppo": int(os.getenv("ROLE_OPPO", "1471153157135667230")),
-}
+})
+VERIFICATION_ROLE_IDS = frozenset(VERIFICATION_ROLES.values())
+
+# Also grant the /set_verification_role fallback role when the sheet already
+# resolved a role. Set to "0" to only use it for entries without a sheet role.
+VERIFICATION_ALWAYS_FALLBACK = os.getenv("VERIFICATION_ALWAYS_FALLBACK", "1") == "1"
 
 # -------------------------------------------------------------------
 # Ticket categories
@@ -69,6 +75,6 @@ TICKET_CATEGORIES = {
 # -------------------------------------------------------------------
 # Timezone
 # -------------------------------------------------------------------
-import pytz
+from zoneinfo import ZoneInfo
 
-TZ_MANILA = pytz.timezone("Asia/Manila")
+TZ_MANILA = ZoneInfo("Asia/Manila")
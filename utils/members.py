@@ -0,0 +1,25 @@
+"""
+Member lookups for a bot that doesn't chunk guilds at startup.
+
+The member cache starts out nearly empty (see main.py), so guild.get_member()
+misses for most users until something fills it. Paths that need every member
+fill the cache once; paths that need one member fetch just that member.
+"""
+import discord
+
+
+async def ensure_member_cache(guild: discord.Guild):
+    """Download *guild*'s full member list on first need (kept current afterwards)."""
+    if not guild.chunked:
+        await guild.chunk()
+
+
+async def get_or_fetch_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    """Return a member from the cache, or fetch it from the API on a miss."""
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except (discord.NotFound, discord.Forbidden):
+        return None
@@ -18,11 +18,17 @@ Two modes:
      - abbrev: team abbreviation used in nickname (e.g. NU)
      - ign: in-game name used in nickname (e.g. ESTACIO)
      - role: not present in sheet; defaults to "player" for all entries
+
+     While auto-refresh is running, the sheet is re-fetched in the background
+     and interactions are served from memory. Unchanged fetches double the
+     interval (up to REFRESH_MAX_INTERVAL); any change resets it.
 """
 
 import asyncio
 import csv
+import hashlib
 import io
+import sys
 import time
 import re
 import urllib.parse
@@ -34,6 +40,15 @@ import aiohttp
 
 CACHE_TTL = 300  # seconds (5 minutes)
 
+# Returned by _fetch_text when a conditional GET says nothing changed
+_NOT_MODIFIED = object()
+
+# Background auto-refresh back-off bounds
+REFRESH_MIN_INTERVAL = 60  # seconds
+# Capped at CACHE_TTL: while auto-refresh runs the TTL isn't checked, so a
+# sheet edit must never take longer than that to reach verification
+REFRESH_MAX_INTERVAL = CACHE_TTL
+
 # Column header mapping: sheet header (lowercased) -> internal key
 COLUMN_MAP = {
     "team name": "team_name",
@@ -43,7 +58,8 @@ COLUMN_MAP = {
     "server": "server",
 }
 
-# Hardcoded test entries (used when no sheet is configured)
+# Hardcoded test entries (used when no sheet is configured).
+# "role" values must be lowercase VERIFICATION_ROLES keys.
 TEST_ENTRIES = [
     {"team_name": "Test Team", "abbrev": "TT", "ign": "TestPlayer1", "uid": "123456789", "server": "1001", "role": "player"},
     {"team_name": "Test Team", "abbrev": "TT", "ign": "TestPlayer2", "uid": "987654321", "server": "1002", "role": "player"},
@@ -96,6 +112,17 @@ class SheetValidator:
         self._gid: str = "0"
         self._tab_name: str | None = None
         self._test_mode: bool = True
+        self._last_hash: str | None = None
+        self._refresh_interval: float = REFRESH_MIN_INTERVAL
+        self._refresh_task: asyncio.Task | None = None
+        # Shared HTTP session (keep-alive) and last ETag for conditional GETs
+        self._session: aiohttp.ClientSession | None = None
+        self._etag: str | None = None
+        # Lookup structures derived from the entries list they were built from
+        self._indexed_src: list[dict] | None = None
+        self._index: dict[tuple[str, str], dict] = {}  # (uid, server) -> entry
+        self._teams: list[str] = []  # sorted, deduplicated
+        self._rosters: dict[str, list[dict]] = {}  # lowercase team -> entries
 
     # ----- Public API -------------------------------------------------------
 
@@ -109,6 +136,9 @@ class SheetValidator:
         self._test_mode = False
         self._cache = None
         self._cache_ts = 0
+        self._last_hash = None
+        self._etag = None
+        self._refresh_interval = REFRESH_MIN_INTERVAL
         return self._sheet_id
 
     def enable_test_mode(self):
@@ -139,27 +169,13 @@ class SheetValidator:
         or None if no match.
         """
         entries = await self._get_entries()
-        u = uid.strip()
-        s = server.strip()
-        for entry in entries:
-            if (
-                entry.get("uid", "").strip() == u
-                and entry.get("server", "").strip() == s
-            ):
-                return entry
-        return None
+        self._ensure_indexes(entries)
+        return self._index.get((uid.strip(), server.strip()))
 
     async def get_teams(self) -> list[str]:
         """Return a sorted, deduplicated list of team names from the data."""
-        entries = await self._get_entries()
-        seen = set()
-        teams = []
-        for e in entries:
-            name = e.get("team_name", "").strip()
-            if name and name not in seen:
-                seen.add(name)
-                teams.append(name)
-        return sorted(teams)
+        self._ensure_indexes(await self._get_entries())
+        return list(self._teams)
 
     async def get_all_entries(self) -> list[dict]:
         """Return all cached entries (for cross-referencing with DB)."""
@@ -167,11 +183,8 @@ class SheetValidator:
 
     async def get_team_roster(self, team_name: str) -> list[dict]:
         """Return all sheet entries for a specific team."""
-        entries = await self._get_entries()
-        return [
-            e for e in entries
-            if e.get("team_name", "").strip().lower() == team_name.strip().lower()
-        ]
+        self._ensure_indexes(await self._get_entries())
+        return list(self._rosters.get(team_name.strip().lower(), ()))
 
     async def refresh(self) -> int:
         """Force a cache refresh. Returns the number of entries loaded."""
@@ -182,6 +195,7 @@ class SheetValidator:
             entries = await self._fetch()
             self._cache = entries
             self._cache_ts = time.monotonic()
+            self._ensure_indexes(entries)
             return len(entries)
 
     def clear_cache(self):
@@ -189,15 +203,41 @@ class SheetValidator:
         self._cache = None
         self._cache_ts = 0
 
+    def start_auto_refresh(self):
+        """Start the background refresh loop (no-op if already running)."""
+        if not self.is_auto_refreshing:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    def stop_auto_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    @property
+    def is_auto_refreshing(self) -> bool:
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    async def close(self):
+        """Stop auto-refresh and close the shared HTTP session."""
+        self.stop_auto_refresh()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     # ----- Internal ---------------------------------------------------------
 
     async def _get_entries(self) -> list[dict]:
         if self._test_mode:
             return TEST_ENTRIES
 
+        # The background loop keeps the cache current; only fetch inline on
+        # first use or when auto-refresh isn't running. A usable cache is
+        # served without the lock so a refresh in flight never blocks it.
+        if self._cache_usable():
+            return self._cache
+
         async with self._lock:
-            now = time.monotonic()
-            if self._cache is not None and (now - self._cache_ts) < CACHE_TTL:
+            if self._cache_usable():  # Filled while we waited for the lock
                 return self._cache
 
             entries = await self._fetch()
@@ -205,47 +245,143 @@ class SheetValidator:
             self._cache_ts = time.monotonic()
             return entries
 
+    def _cache_usable(self) -> bool:
+        return self._cache is not None and (
+            self.is_auto_refreshing or (time.monotonic() - self._cache_ts) < CACHE_TTL
+        )
+
+    def _ensure_indexes(self, entries: list[dict]):
+        """(Re)build lookup structures in one pass when *entries* has changed."""
+        if entries is self._indexed_src:
+            return
+        index: dict[tuple[str, str], dict] = {}
+        rosters: dict[str, list[dict]] = {}
+        teams: set[str] = set()
+        for entry in entries:
+            key = (entry.get("uid", "").strip(), entry.get("server", "").strip())
+            index.setdefault(key, entry)  # First row wins
+            name = entry.get("team_name", "").strip()
+            if name:
+                teams.add(name)
+            rosters.setdefault(name.lower(), []).append(entry)
+        self._index = index
+        self._rosters = rosters
+        self._teams = sorted(teams)
+        self._indexed_src = entries
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            if self._test_mode or not self._sheet_id:
+                continue
+            try:
+                await self._auto_refresh()
+            except Exception as e:
+                print(f"Sheet auto-refresh error: {e}")
+
+    async def _auto_refresh(self):
+        # The download and parse run without the lock; readers keep using the
+        # current cache until the new entries are swapped in below.
+        source = self._cache
+        previous = self._last_hash
+        text = await self._fetch_text(conditional=source is not None)
+        if text is None:
+            return  # Keep serving cached data, retry at the same interval
+
+        if text is _NOT_MODIFIED:
+            self._cache_ts = time.monotonic()
+            self._refresh_interval = min(self._refresh_interval * 2, REFRESH_MAX_INTERVAL)
+            return
+
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if digest == previous and source is not None:
+            self._cache_ts = time.monotonic()
+            self._refresh_interval = min(self._refresh_interval * 2, REFRESH_MAX_INTERVAL)
+            return
+
+        entries = self._parse_csv(text)
+        async with self._lock:
+            if self._cache is not source:
+                return  # A forced refresh or reconfigure replaced the cache meanwhile
+            self._cache = entries
+            self._cache_ts = time.monotonic()
+            # Index off the hot path so the next validate() is a pure lookup
+            self._ensure_indexes(entries)
+            self._last_hash = digest
+            self._refresh_interval = REFRESH_MIN_INTERVAL
+
     async def _fetch(self) -> list[dict]:
         if not self._sheet_id:
             return TEST_ENTRIES
 
+        text = await self._fetch_text()
+        if text is None:
+            return self._cache or []
+
+        self._last_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        self._refresh_interval = REFRESH_MIN_INTERVAL
+        return self._parse_csv(text)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(headers={
+                "Cache-Control": "no-cache, no-store, must-revalidate",
+                "Pragma": "no-cache",
+            })
+        return self._session
+
+    async def _fetch_text(self, conditional: bool = False):
+        """Download the sheet as CSV text.
+
+        Returns None on failure, or _NOT_MODIFIED when *conditional* is set
+        and the server answers 304 to our If-None-Match.
+        """
         # Prefer tab-name URL; fall back to GID-based URL
         if self._tab_name:
             url = _build_csv_url_by_name(self._sheet_id, self._tab_name)
         else:
             url = _build_csv_url(self._sheet_id, self._gid)
 
+        headers = {}
+        if conditional and self._etag:
+            headers["If-None-Match"] = self._etag
+
         try:
-            headers = {
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-            }
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                    if resp.status != 200:
-                        print(f"Sheet fetch failed (HTTP {resp.status}), using cached data")
-                        return self._cache or []
-                    text = await resp.text()
+            session = self._get_session()
+            async with session.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)
+            ) as resp:
+                if resp.status == 304:
+                    return _NOT_MODIFIED
+                if resp.status != 200:
+                    print(f"Sheet fetch failed (HTTP {resp.status}), using cached data")
+                    return None
+                self._etag = resp.headers.get("ETag")
+                return await resp.text()
         except Exception as e:
             print(f"Sheet fetch error: {e}, using cached data")
-            return self._cache or []
-
-        return self._parse_csv(text)
+            return None
 
     @staticmethod
     def _parse_csv(text: str) -> list[dict]:
-        reader = csv.DictReader(io.StringIO(text))
+        reader = csv.reader(io.StringIO(text))
+        header = next(reader, None)
+        if not header:
+            return []
+
+        # Resolve header -> internal key once, not per row
+        columns = [
+            (idx, COLUMN_MAP[h.strip().lower()])
+            for idx, h in enumerate(header)
+            if h and h.strip().lower() in COLUMN_MAP
+        ]
+
         entries = []
         for row in reader:
-            # Normalize headers to lowercase and map to internal keys
             normalized = {}
-            for k, v in row.items():
-                if not k:
-                    continue
-                key_lower = k.strip().lower()
-                internal_key = COLUMN_MAP.get(key_lower)
-                if internal_key:
-                    normalized[internal_key] = v.strip() if v else ""
+            for idx, internal_key in columns:
+                v = row[idx] if idx < len(row) else ""
+                normalized[internal_key] = v.strip() if v else ""
 
             # Skip rows with empty UID or empty IGN (blank substitute slots)
             uid_val = normalized.get("uid", "")
@@ -253,6 +389,12 @@ class SheetValidator:
             if not uid_val or not ign_val:
                 continue
 
+            # Team / abbrev repeat across the roster -- keep one copy each
+            if "team_name" in normalized:
+                normalized["team_name"] = sys.intern(normalized["team_name"])
+            if "abbrev" in normalized:
+                normalized["abbrev"] = sys.intern(normalized["abbrev"])
+
             # All sheet entries are players (no role column in sheet)
             normalized["role"] = "player"
 
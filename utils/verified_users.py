@@ -0,0 +1,45 @@
+"""
+In-memory view of the verified_users table.
+
+Loaded in full by the Verification cog at startup and updated by every
+verified_users write it makes (all of them live in that cog). Other cogs,
+e.g. Voice for VC team restrictions, only read it. The table's
+UNIQUE(guild_id, discord_id) remains the authoritative race guard.
+"""
+
+
+class VerifiedUsers:
+    """guild_id -> {discord_id: team_name} ("" for a row without a team)."""
+
+    def __init__(self):
+        self._guilds: dict[int, dict[int, str]] = {}
+
+    def load(self, rows: list[dict]):
+        """Replace the cache with verified_users rows (guild_id, discord_id, team_name)."""
+        guilds: dict[int, dict[int, str]] = {}
+        for r in rows:
+            guilds.setdefault(r["guild_id"], {})[r["discord_id"]] = r["team_name"] or ""
+        self._guilds = guilds
+
+    def is_verified(self, guild_id: int, user_id: int) -> bool:
+        return user_id in self._guilds.get(guild_id, ())
+
+    def get_team(self, guild_id: int, user_id: int) -> str | None:
+        """Return the user's verified team name, or None if unverified/teamless."""
+        members = self._guilds.get(guild_id)
+        return (members.get(user_id) or None) if members else None
+
+    def add(self, guild_id: int, user_id: int, team_name: str | None):
+        self._guilds.setdefault(guild_id, {})[user_id] = team_name or ""
+
+    def remove(self, guild_id: int, user_ids):
+        members = self._guilds.get(guild_id)
+        if members:
+            for user_id in user_ids:
+                members.pop(user_id, None)
+
+
+# ---------------------------------------------------------------------------
+# Singleton instance (shared across the bot)
+# ---------------------------------------------------------------------------
+verified_users = VerifiedUsers()
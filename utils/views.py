@@ -67,6 +67,7 @@ class CancelScheduledEmbedView(discord.ui.View):
         await Database.execute(
             "DELETE FROM scheduled_embeds WHERE identifier = %s", (identifier,)
         )
+        self.embeds_cog.forget_scheduled(identifier)
         await interaction.response.edit_message(
             content=f"✅ Cancelled scheduled embed `{identifier}`.", view=None
         )